@@ -4,7 +4,7 @@ This module provides the base interface that all communication implementations s
 enabling easy substitution of different messaging technologies.
 """
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Callable, Optional
+from typing import Any, Dict, Callable, List, Optional
 
 
 class IMessageBroker(ABC):
@@ -74,6 +74,33 @@ class IMessageBroker(ABC):
             bool: True if successful, False otherwise
         """
 
+    @abstractmethod
+    def send_raw_result(self, destination: str, body: bytes) -> bool:
+        """
+        Send an already JSON-encoded result object to the specified destination.
+
+        Args:
+            destination: The destination identifier
+            body: The serialized JSON object, without routing fields
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+
+    @abstractmethod
+    def send_results(self, destination: str,
+                     results: List[Dict[str, Any]]) -> bool:
+        """
+        Send several results to the specified destination as one message.
+
+        Args:
+            destination: The destination identifier
+            results: The results to send, in order
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+
     @abstractmethod
     def close(self) -> None:
         """
@@ -3,7 +3,7 @@ Implementation of the RabbitMQ-specific interfaces.
 This module defines interface classes for RabbitMQ management and message handling.
 """
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Callable, Optional
+from typing import Dict, Any, Callable, List, Optional
 import pika
 from pika.spec import BasicProperties
 
@@ -28,6 +28,15 @@ class IRabbitMQManager(IMessageBroker):
         Set up RabbitMQ infrastructure (exchanges, queues, bindings).
         """
 
+    @abstractmethod
+    def set_qos(self, prefetch_count: int) -> None:
+        """
+        Limit the number of unacknowledged messages delivered to the agent.
+
+        Args:
+            prefetch_count (int): Maximum number of unacknowledged messages.
+        """
+
     @abstractmethod
     def register_message_handler(
         self,
@@ -85,6 +94,44 @@ class IRabbitMQManager(IMessageBroker):
             bool: True if the result was sent successfully, False otherwise.
         """
 
+    @abstractmethod
+    def set_reply_to(self, destination: str, reply_to: Optional[str]) -> None:
+        """
+        Route results for a destination to the reply-to queue of its request.
+
+        Args:
+            destination (str): The destination identifier (e.g., 'dt', 'pt').
+            reply_to (Optional[str]): The requested reply-to queue, or None
+                to publish on the output exchange.
+        """
+
+    @abstractmethod
+    def send_raw_result(self, destination: str, body: bytes) -> bool:
+        """
+        Send an already JSON-encoded result object to the specified destination.
+
+        Args:
+            destination (str): The destination identifier (e.g., 'dt', 'pt').
+            body (bytes): The serialized JSON object, without routing fields.
+
+        Returns:
+            bool: True if the result was sent successfully, False otherwise.
+        """
+
+    @abstractmethod
+    def send_results(self, destination: str,
+                     results: List[Dict[str, Any]]) -> bool:
+        """
+        Send several results to the specified destination as one message.
+
+        Args:
+            destination (str): The destination identifier (e.g., 'dt', 'pt').
+            results (List[Dict[str, Any]]): The results to send, in order.
+
+        Returns:
+            bool: True if the results were sent successfully, False otherwise.
+        """
+
     @abstractmethod
     def close(self) -> None:
         """
@@ -17,6 +17,9 @@ from ...core.streaming import handle_streaming_simulation
 
 logger = get_logger()
 
+# libyaml-based loader when PyYAML was built with it
+_SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 class SimulationInputs(BaseModel):
     """Model for simulation inputs - dynamic fields allowed"""
@@ -110,6 +113,8 @@ class MessageHandler(IRabbitMQMessageHandler):
 
         # Extract the message source
         source: str = method.routing_key.split('.')[0]
+        # Answer on the requester's reply-to queue when it asked for one
+        self.rabbitmq_manager.set_reply_to(source, properties.reply_to)
 
         try:
             # Load the message body as YAML
@@ -117,7 +122,7 @@ class MessageHandler(IRabbitMQMessageHandler):
                 # Initialize msg_dict to avoid reference issues in case of
                 # parsing error
                 msg_dict = {}
-                msg_dict = yaml.safe_load(body)
+                msg_dict = yaml.load(body, Loader=_SafeLoader)
                 logger.debug("Parsed message: %s", msg_dict)
             except yaml.YAMLError as e:
                 logger.error("YAML parsing error: %s", e)
@@ -3,9 +3,10 @@ RabbitMQManager class for managing RabbitMQ connections, exchanges, queues, and
 This module provides functionality to establish connections with RabbitMQ,
 set up exchanges and queues, and send/receive messages within a simulation agent framework.
 """
+import json
 import sys
 import uuid
-from typing import Dict, Any, Callable, Optional
+from typing import Dict, Any, Callable, List, Optional, Tuple
 
 import yaml
 import pika
@@ -17,6 +18,9 @@ from ...utils.logger import get_logger
 
 logger = get_logger()
 
+# libyaml-based dumper when PyYAML was built with it; same output as yaml.dump
+_Dumper = getattr(yaml, "CDumper", yaml.Dumper)
+
 
 class RabbitMQManager(IRabbitMQManager):
     """
@@ -40,6 +44,9 @@ class RabbitMQManager(IRabbitMQManager):
         self.message_handler: Optional[Callable[[
             pika.adapters.blocking_connection.BlockingChannel,
             pika.spec.Basic.Deliver, BasicProperties, bytes], None]] = None
+        # Reply-to queues requested by the message currently handled for
+        # each destination (e.g. RabbitMQ's amq.rabbitmq.reply-to)
+        self.reply_routes: Dict[str, str] = {}
 
     def connect(self) -> bool:
         """
@@ -54,21 +61,27 @@ class RabbitMQManager(IRabbitMQManager):
 
         for attempt in range(1, max_retries + 1):
             try:
-                logger.debug("Connecting to RabbitMQ (attempt %d)...", attempt)
-                credentials = pika.PlainCredentials(
-                    rabbitmq_config.get('username', 'guest'),
-                    rabbitmq_config.get('password', 'guest')
-                )
-                vhost = rabbitmq_config.get('vhost', '/')
-                logger.debug(f"Using vhost: {vhost}")
-                parameters = pika.ConnectionParameters(
-                    host=rabbitmq_config.get('host', 'localhost'),
-                    port=rabbitmq_config.get('port', 5672),
-                    virtual_host=vhost,
-                    credentials=credentials,
-                    heartbeat=rabbitmq_config.get('heartbeat', 600)
-                )
-                self.connection = pika.BlockingConnection(parameters)
+                if self.connection and self.connection.is_open:
+                    # Only the channel was lost: open a new one on the
+                    # existing connection instead of a second handshake
+                    logger.debug("Reusing open RabbitMQ connection")
+                else:
+                    logger.debug(
+                        "Connecting to RabbitMQ (attempt %d)...", attempt)
+                    credentials = pika.PlainCredentials(
+                        rabbitmq_config.get('username', 'guest'),
+                        rabbitmq_config.get('password', 'guest')
+                    )
+                    vhost = rabbitmq_config.get('vhost', '/')
+                    logger.debug(f"Using vhost: {vhost}")
+                    parameters = pika.ConnectionParameters(
+                        host=rabbitmq_config.get('host', 'localhost'),
+                        port=rabbitmq_config.get('port', 5672),
+                        virtual_host=vhost,
+                        credentials=credentials,
+                        heartbeat=rabbitmq_config.get('heartbeat', 600)
+                    )
+                    self.connection = pika.BlockingConnection(parameters)
 
                 if self.connection.is_open:
                     logger.debug(
@@ -78,6 +91,8 @@ class RabbitMQManager(IRabbitMQManager):
                     if self.channel and self.channel.is_open:
                         logger.debug(
                             "Successfully connected to RabbitMQ and channel is open.")
+                        self.set_qos(self.config.get('queue', {}).get(
+                            'prefetch_count', 1))
                         return True
                     else:
                         logger.error("Channel creation failed. Retrying...")
@@ -144,16 +159,24 @@ class RabbitMQManager(IRabbitMQManager):
             logger.debug(
                 "Declared and bound input queue: %s",
                 self.input_queue_name)
-
-            # Set QoS (prefetch count)
-            self.channel.basic_qos(
-                prefetch_count=queue_config.get('prefetch_count', 1)
-            )
         except pika.exceptions.ChannelClosedByBroker as e:
             logger.error(
                 "Channel closed by broker while setting up infrastructure: %s", e)
             sys.exit(1)
 
+    def set_qos(self, prefetch_count: int) -> None:
+        """
+        Limit the number of unacknowledged messages delivered to the agent.
+
+        Applied on every (re)connection so that a reopened channel keeps the
+        configured back pressure.
+
+        Args:
+            prefetch_count (int): Maximum number of unacknowledged messages
+        """
+        self.channel.basic_qos(prefetch_count=prefetch_count)
+        logger.debug("Set channel prefetch count to %d", prefetch_count)
+
     def register_message_handler(
         self,
         handler_func: Callable[
@@ -247,6 +270,36 @@ class RabbitMQManager(IRabbitMQManager):
             logger.error("Unexpected error: %s", e)
             return False
 
+    def set_reply_to(self, destination: str, reply_to: Optional[str]) -> None:
+        """
+        Route results for a destination to the reply-to queue of its request.
+
+        Args:
+            destination (str): Destination identifier (e.g., 'dt', 'pt')
+            reply_to (Optional[str]): Reply-to queue requested by the
+                destination, or None to use the output exchange
+        """
+        if reply_to:
+            self.reply_routes[destination] = reply_to
+        else:
+            self.reply_routes.pop(destination, None)
+
+    def _result_route(self, destination: str) -> Tuple[str, str]:
+        """
+        Return the exchange and routing key to publish a result on.
+
+        Results for a request carrying a reply-to queue go through the
+        default exchange straight to that queue, which supports RabbitMQ's
+        direct reply-to; all other results go to the output exchange.
+        """
+        reply_to = self.reply_routes.get(destination)
+        if reply_to:
+            return '', reply_to
+        exchanges: Dict[str, str] = self.config.get('exchanges', {})
+        # Routing key: <source>.result.<destination>
+        return (exchanges.get('output', 'ex.sim.result'),
+                f"{self.agent_id}.result.{destination}")
+
     def send_result(self, destination: str, result: Dict[str, Any]) -> bool:
         """
         Send simulation results to the specified destination.
@@ -258,9 +311,6 @@ class RabbitMQManager(IRabbitMQManager):
         Returns:
             bool: True if successful, False otherwise
         """
-        exchanges: Dict[str, str] = self.config.get('exchanges', {})
-        output_exchange: str = exchanges.get('output', 'ex.sim.result')
-
         # Prepare the payload with the destination
         payload: Dict[str, Any] = {
             **result,  # Result data
@@ -272,10 +322,10 @@ class RabbitMQManager(IRabbitMQManager):
         message_id: str = str(uuid.uuid4())
 
         # Serialize to YAML
-        payload_yaml: str = yaml.dump(payload, default_flow_style=False)
+        payload_yaml: str = yaml.dump(
+            payload, default_flow_style=False, Dumper=_Dumper)
 
-        # Routing key: <source>.result.<destination>
-        routing_key: str = f"{self.agent_id}.result.{destination}"
+        output_exchange, routing_key = self._result_route(destination)
 
         properties: BasicProperties = pika.BasicProperties(
             delivery_mode=2,  # Persistent message
@@ -297,6 +347,83 @@ class RabbitMQManager(IRabbitMQManager):
 
         return success
 
+    def send_raw_result(self, destination: str, body: bytes) -> bool:
+        """
+        Send an already JSON-encoded result object to the specified destination.
+
+        The routing fields added by send_result are spliced in before the
+        closing brace, so the body is published without being re-parsed.
+
+        Args:
+            destination (str): Destination identifier (e.g., 'dt', 'pt')
+            body (bytes): Serialized JSON object, without routing fields
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        output_exchange, routing_key = self._result_route(destination)
+        routing_fields: bytes = json.dumps(
+            {'source': self.agent_id, 'destinations': [destination]}
+        ).encode()
+        payload: bytes = body.rstrip()[:-1] + b', ' + routing_fields[1:]
+        message_id: str = str(uuid.uuid4())
+        properties: BasicProperties = pika.BasicProperties(
+            delivery_mode=2,  # Persistent message
+            content_type='application/json',
+            message_id=message_id
+        )
+
+        success: bool = self.send_message(
+            output_exchange, routing_key, payload, properties)
+        if success:
+            logger.debug(
+                "Sent raw result to %s with message ID: %s",
+                destination,
+                message_id)
+        else:
+            logger.error("Failed to send result to %s", destination)
+        return success
+
+    def send_results(self, destination: str,
+                     results: List[Dict[str, Any]]) -> bool:
+        """
+        Send several simulation results to the specified destination as a
+        single message, listed under 'results' in publication order.
+
+        Args:
+            destination (str): Destination identifier (e.g., 'dt', 'pt')
+            results (List[Dict[str, Any]]): Result data to be sent
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        payload: Dict[str, Any] = {
+            'results': results,
+            'source': self.agent_id,
+            'destinations': [destination]
+        }
+        message_id: str = str(uuid.uuid4())
+        payload_yaml: str = yaml.dump(
+            payload, default_flow_style=False, Dumper=_Dumper)
+        output_exchange, routing_key = self._result_route(destination)
+        properties: BasicProperties = pika.BasicProperties(
+            delivery_mode=2,  # Persistent message
+            content_type='application/x-yaml',
+            message_id=message_id
+        )
+
+        success: bool = self.send_message(
+            output_exchange, routing_key, payload_yaml, properties)
+        if success:
+            logger.debug(
+                "Sent %d results to %s with message ID: %s",
+                len(results),
+                destination,
+                message_id)
+        else:
+            logger.error("Failed to send results to %s", destination)
+        return success
+
     def close(self) -> None:
         """
         Close the RabbitMQ connection.
@@ -12,6 +12,7 @@ from ..utils.config_manager import ConfigManager
 from ..utils.logger import get_logger
 from ..utils.performance_monitor import PerformanceMonitor
 from ..comm.connect import Connect
+from .streaming import close_listeners
 
 # Configure logger
 logger = get_logger()
@@ -85,6 +86,7 @@ class MatlabAgent:
         """
         logger.info("Stopping MATLAB agent")
         self.comm.close()
+        close_listeners()
 
         # Log performance summary before stopping
         summary = self.performance_monitor.get_summary()
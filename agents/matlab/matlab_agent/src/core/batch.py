@@ -5,8 +5,9 @@ This module provides functionality to process MATLAB simulation requests receive
 the Connect messaging abstraction layer.
 """
 
-import sys
+import logging
 import time
+import traceback
 from typing import Dict, List, Any, Tuple, Optional
 
 import yaml
@@ -170,7 +171,9 @@ def _get_metadata(sim: MatlabSimulator) -> Dict[str, Any]:
 def _send_response(broker: IMessageBroker, source: str,
                    response: Dict[str, Any]) -> None:
     """Send response through message broker."""
-    logger.debug(yaml.dump(response))
+    # Only serialize the response when it will actually be logged
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(yaml.dump(response))
     broker.send_result(source, response)
 
 
@@ -190,7 +193,8 @@ def _handle_error(error: Exception,
         error={
             'message': str(error),
             'type': error_type,
-            'traceback': sys.exc_info() if response_templates.get(
+            'traceback': ''.join(traceback.format_exception(error))
+            if response_templates.get(
                 'error',
                 {}).get(
                 'include_stacktrace',
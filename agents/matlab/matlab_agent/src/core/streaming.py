@@ -7,23 +7,92 @@ real-time output streaming through the Connect messaging abstraction layer.
 
 import json
 import os
+import selectors
+import shutil
 import socket
 import subprocess
-import sys
+import threading
 import time
+import traceback
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import IO, Any, Callable, Dict, List, Optional, Tuple
 
 import psutil
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+try:
+    # orjson is optional: it parses bytes directly and is several times
+    # faster than the standard library on per-message payloads
+    from orjson import (
+        OPT_APPEND_NEWLINE, OPT_NON_STR_KEYS, dumps as _orjson_dumps,
+        loads as _json_loads)
+
+    # Non-string keys (e.g. YAML's {1: 2.5}) are converted to strings, as
+    # the standard library does, instead of raising TypeError
+    def _json_dumps(obj: Any) -> bytes:
+        return _orjson_dumps(obj, option=OPT_NON_STR_KEYS)
+
+    def _json_line(obj: Any) -> bytes:
+        return _orjson_dumps(
+            obj, option=OPT_NON_STR_KEYS | OPT_APPEND_NEWLINE)
+except ImportError:
+    # Like orjson, reject NaN and Infinity, which the standard library
+    # accepts by default but strict JSON consumers do not
+    def _reject_constant(name: str) -> Any:
+        raise ValueError(f"Out of range float values are not JSON: {name}")
+
+    def _json_loads(data: Any) -> Any:
+        return json.loads(data, parse_constant=_reject_constant)
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, allow_nan=False).encode()
+
+    def _json_line(obj: Any) -> bytes:
+        return (json.dumps(obj) + '\n').encode()
+
 from ..comm.interfaces import IMessageBroker
-from ..utils.create_response import create_response
+from ..utils.create_response import (
+    create_response, response_builder, timestamp_formatter)
 from ..utils.logger import get_logger
 from ..utils.performance_monitor import PerformanceMonitor
 
 # Configure logger
 logger = get_logger()
 
+# Size of a single socket read; the receive buffer grows beyond this only
+# when a single line does not fit
+RECV_BUFFER_SIZE = 64 * 1024
+# Default kernel receive buffer for MATLAB connections, so output bursts
+# are queued instead of throttling MATLAB; 0 keeps the OS default
+SOCKET_RCVBUF_SIZE = 1 << 20
+# Buffer size of the Python file objects reading MATLAB stdout/stderr, and
+# of the kernel pipes themselves where they can be resized (Linux)
+PIPE_BUFFER_SIZE = 1 << 20
+# fcntl command resizing a pipe, None on platforms without it
+F_SETPIPE_SZ = getattr(fcntl, 'F_SETPIPE_SZ', None)
+
+# Seconds between resource usage samples while a simulation runs
+METADATA_SAMPLE_INTERVAL = 1.0
+# Supported framings for MATLAB outputs on the TCP connection
+WIRE_FORMATS = ('json', 'msgpack')
+# Upper bound on a single buffered msgpack message
+MSGPACK_MAX_BUFFER_SIZE = 64 << 20
+# How often to check for MATLAB exit while waiting for it to connect, on
+# platforms without pidfd support
+PROCESS_POLL_INTERVAL = 1.0
+# Seconds MATLAB and its child processes get to exit before being killed
+MATLAB_STOP_TIMEOUT = 10
+# Selector key data marking the MATLAB process exit notification
+_PROCESS_EXIT = object()
+
+# Listening sockets kept open across simulations, keyed by (host, port)
+_LISTENERS: Dict[Tuple[str, int], socket.socket] = {}
+
 
 def handle_streaming_simulation(
     msg_dict: Dict[str, Any],
@@ -129,6 +198,85 @@ def handle_streaming_simulation(
             controller.close()
 
 
+@lru_cache(maxsize=256)
+def _resolved_sim_dir(path: str) -> Path:
+    """Resolve a simulation directory, cached per configured path."""
+    return Path(path).resolve()
+
+
+def _validated_sim_path(path: str, file: str) -> Path:
+    """
+    Resolve the simulation directory and check that it contains the file.
+
+    Only the path resolution is cached: the file is looked up on every
+    request, so one removed after an earlier run is still reported as
+    missing instead of failing later inside MATLAB.
+    """
+    sim_path = _resolved_sim_dir(path)
+    # A single lookup covers the common case: if the file exists, its
+    # parent is necessarily a directory
+    if (sim_path / file).exists():
+        return sim_path
+    if not sim_path.is_dir():
+        raise FileNotFoundError(f"Directory not found: {sim_path}")
+    raise FileNotFoundError(
+        f"Simulation file '{file}' not found in directory '{sim_path}'.")
+
+
+def _get_listener(
+        host: str, port: int, recv_buffer_size: int = 0) -> socket.socket:
+    """
+    Return the listening socket for host and port, creating it on first use.
+
+    The receive buffer size is set before listen() so accepted connections
+    inherit it and can negotiate a matching TCP window.
+    """
+    listener = _LISTENERS.get((host, port))
+    if listener is None or listener.fileno() == -1:
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if recv_buffer_size:
+            listener.setsockopt(
+                socket.SOL_SOCKET, socket.SO_RCVBUF, recv_buffer_size)
+        listener.bind((host, port))
+        listener.listen()
+        _LISTENERS[(host, port)] = listener
+    return listener
+
+
+def _drop_pending_connections(listener: socket.socket) -> None:
+    """
+    Close connections queued on a listener before MATLAB is launched.
+
+    They come from earlier (possibly killed) MATLAB runs or stray clients,
+    and would otherwise be accepted as the new simulation's connection.
+    """
+    listener.setblocking(False)
+    try:
+        while True:
+            try:
+                connection, address = listener.accept()
+            except (BlockingIOError, InterruptedError):
+                break
+            logger.warning("Dropping stale connection from %s", address)
+            connection.close()
+    finally:
+        listener.setblocking(True)
+
+
+def close_listeners() -> None:
+    """Close the listening sockets shared by streaming simulations."""
+    while _LISTENERS:
+        _, listener = _LISTENERS.popitem()
+        listener.close()
+
+
+@lru_cache(maxsize=None)
+def _matlab_executable() -> str:
+    """Absolute path of the MATLAB launcher, falling back to a PATH lookup."""
+    return shutil.which('matlab') or 'matlab'
+
+
 class MatlabStreamingError(Exception):
     """Custom exception for MATLAB streaming errors."""
 
@@ -136,38 +284,168 @@ class MatlabStreamingError(Exception):
 class StreamingConnection:
     """Manages socket connection and MATLAB process lifecycle."""
 
-    def __init__(self, host: str, port: int) -> None:
+    def __init__(
+            self, host: str, port: int, recv_buffer_size: int = 0) -> None:
         self.host = host
         self.port = port
+        self.recv_buffer_size = recv_buffer_size
         self.socket: Optional[socket.socket] = None
         self.connection: Optional[socket.socket] = None
         self.matlab_process: Optional[subprocess.Popen] = None
+        self.output_readers: List[threading.Thread] = []
 
     def start_server(self) -> None:
-        """Start TCP socket server."""
-        self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        self.socket.bind((self.host, self.port))
-        self.socket.listen()
+        """
+        Attach to the shared TCP listening socket for host and port,
+        dropping connections left over from earlier simulations.
+        """
+        self.socket = _get_listener(
+            self.host, self.port, self.recv_buffer_size)
+        _drop_pending_connections(self.socket)
 
     def accept_connection(self, timeout: int = 120) -> None:
-        """Accept incoming connection with timeout."""
+        """
+        Accept incoming connection with timeout.
+
+        Fails as soon as the MATLAB process exits without connecting instead
+        of waiting for the full timeout.
+        """
+        with selectors.DefaultSelector() as selector:
+            selector.register(self.socket, selectors.EVENT_READ)
+            pidfd = self._register_process_exit(selector)
+            try:
+                self._wait_for_client(selector, pidfd is not None, timeout)
+            finally:
+                if pidfd is not None:
+                    os.close(pidfd)
         self.socket.settimeout(timeout)
         self.connection, _ = self.socket.accept()
         self.connection.settimeout(None)
 
+    def _register_process_exit(
+            self, selector: selectors.BaseSelector) -> Optional[int]:
+        """Watch the MATLAB process for exit through a pidfd, if supported."""
+        if self.matlab_process is None or not hasattr(os, 'pidfd_open'):
+            return None
+        try:
+            pidfd = os.pidfd_open(self.matlab_process.pid)
+        except OSError:
+            return None
+        selector.register(pidfd, selectors.EVENT_READ, data=_PROCESS_EXIT)
+        return pidfd
+
+    def _wait_for_client(
+            self,
+            selector: selectors.BaseSelector,
+            watches_exit: bool,
+            timeout: float) -> None:
+        """Block until the listener is readable, MATLAB exits or time runs out."""
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise socket.timeout("Timed out waiting for MATLAB connection")
+            if not watches_exit:
+                remaining = min(remaining, PROCESS_POLL_INTERVAL)
+            events = selector.select(remaining)
+            if any(key.data is not _PROCESS_EXIT for key, _ in events):
+                return
+            if events or (self.matlab_process is not None
+                          and self.matlab_process.poll() is not None):
+                raise MatlabStreamingError(
+                    "MATLAB process exited before connecting")
+
+    def start_output_readers(self) -> None:
+        """Drain MATLAB stdout/stderr in background so the pipes never fill."""
+        streams = (
+            (self.matlab_process.stdout, logger.info),
+            (self.matlab_process.stderr, logger.warning)
+        )
+        for stream, log_fn in streams:
+            if stream is None:
+                continue
+            _resize_pipe(stream)
+            reader = threading.Thread(
+                target=_drain_stream,
+                args=(stream, log_fn),
+                daemon=True
+            )
+            reader.start()
+            self.output_readers.append(reader)
+
     def close(self) -> None:
-        """Close all connections and processes."""
+        """
+        Close the MATLAB connection and process.
+
+        The listening socket is shared across simulations and stays open.
+        """
         if self.connection:
             self.connection.close()
-        if self.socket:
-            self.socket.close()
+        self.socket = None
         if self.matlab_process and self.matlab_process.poll() is None:
+            # The matlab launcher runs MATLAB as a child process, so the
+            # tree is collected before the launcher exits and orphans it
+            children = _child_processes(self.matlab_process.pid)
             self.matlab_process.terminate()
             try:
-                self.matlab_process.wait(timeout=10)
+                self.matlab_process.wait(timeout=MATLAB_STOP_TIMEOUT)
             except subprocess.TimeoutExpired:
                 self.matlab_process.kill()
+            _stop_processes(children)
+        for reader in self.output_readers:
+            reader.join(timeout=1)
+        self.output_readers.clear()
+
+
+def _child_processes(pid: int) -> List[psutil.Process]:
+    """Return all descendants of a process, or none if it is gone."""
+    try:
+        return psutil.Process(pid).children(recursive=True)
+    except psutil.Error:
+        return []
+
+
+def _stop_processes(processes: List[psutil.Process]) -> None:
+    """Terminate processes, killing those still running after the timeout."""
+    for process in processes:
+        try:
+            process.terminate()
+        except psutil.NoSuchProcess:
+            pass
+    _, alive = psutil.wait_procs(processes, timeout=MATLAB_STOP_TIMEOUT)
+    for process in alive:
+        try:
+            process.kill()
+        except psutil.NoSuchProcess:
+            pass
+
+
+def _resize_pipe(stream: IO[bytes]) -> None:
+    """
+    Grow the kernel buffer of a MATLAB output pipe to PIPE_BUFFER_SIZE, so
+    bursts of output do not block MATLAB while the reader catches up.
+
+    Popen's bufsize only sizes the Python file object, and the pipe has to
+    be resized after Popen so MATLAB can still be launched via posix_spawn.
+    """
+    if F_SETPIPE_SZ is None:
+        return
+    try:
+        fcntl.fcntl(stream.fileno(), F_SETPIPE_SZ, PIPE_BUFFER_SIZE)
+    except OSError as e:
+        # Unprivileged processes are capped by /proc/sys/fs/pipe-max-size
+        logger.debug("Could not resize MATLAB output pipe: %s", e)
+
+
+def _drain_stream(stream: IO[bytes], log_fn: Callable[..., None]) -> None:
+    """Forward each line of a MATLAB output stream to the logger."""
+    try:
+        with stream:
+            for line in iter(stream.readline, b''):
+                log_fn("MATLAB: %s", line.decode(errors='replace').rstrip())
+    except (OSError, ValueError):
+        # The pipe was closed while the process was being torn down
+        pass
 
 
 class MatlabStreamingController:
@@ -187,37 +465,63 @@ class MatlabStreamingController:
         bridge_meta: Optional[str] = 'unknown',
         request_id: Optional[str] = 'unknown'
     ) -> None:
-        self.sim_path: Path = Path(path).resolve()
+        self.sim_path: Path = _validated_sim_path(path, file)
         self.sim_file: str = file
         self.bridge_meta: str = bridge_meta
         self.request_id: str = request_id
         self.source: str = source
         self.message_broker: IMessageBroker = message_broker
-        self.start_time: Optional[float] = None
+        # Monotonic start reference, immune to wall-clock adjustments
+        self.start_time_ns: Optional[int] = None
+        # Resource usage is sampled periodically instead of on every call
+        self._agent_process: Optional[psutil.Process] = None
+        self._matlab_process: Optional[psutil.Process] = None
+        self._resource_snapshot: Dict[str, Any] = {}
+        self._sampler: Optional[threading.Thread] = None
+        self._stop_sampling = threading.Event()
         self.response_templates: Dict = response_templates
+        # Response builders for per-message outputs, bound once per simulation
+        self._make_progress = response_builder(
+            'progress', file, 'streaming', response_templates,
+            bridge_meta, request_id)
+        self._make_streaming = response_builder(
+            'streaming', file, 'streaming', response_templates,
+            bridge_meta, request_id)
         host = tcp_settings.get('host', 'localhost')
         port = tcp_settings.get('port', 5678)
-        self.connection = StreamingConnection(host, port)
+        self.wire_format: str = tcp_settings.get('wire_format', 'json')
+        if self.wire_format not in WIRE_FORMATS:
+            raise ValueError(
+                f"Unsupported wire format: {self.wire_format}")
+        self.connection = StreamingConnection(
+            host, port, tcp_settings.get('recv_buffer_size', SOCKET_RCVBUF_SIZE))
+        # Streaming outputs are published in batches of up to batch_size,
+        # held for at most batch_delay seconds; a size of 1 disables batching
+        self.batch_size: int = max(1, int(tcp_settings.get('batch_size', 1)))
+        self.batch_delay: float = tcp_settings.get('batch_delay_ms', 10) / 1000
+        self._batch: Dict[Any, Dict[str, Any]] = {}
+        self._batch_deadline: float = 0.0
+        # Coalescing keeps only the latest value of each signal in a batch
+        self.coalesce: bool = bool(tcp_settings.get('coalesce', False))
+        # Pass-through publishes plain outputs as JSON assembled from
+        # pre-encoded fragments, without building a response per message
+        self.passthrough: bool = bool(tcp_settings.get('passthrough', False))
+        streaming_template = response_templates.get('streaming', {})
+        self._raw_timestamp = timestamp_formatter(streaming_template.get(
+            'timestamp_format', '%Y-%m-%dT%H:%M:%SZ'))
+        self._raw_prefix: bytes = _json_dumps({
+            'simulation': {'name': file, 'type': 'streaming'},
+            'status': streaming_template.get('status', 'streaming'),
+            'bridge_meta': bridge_meta,
+            'request_id': request_id
+        })[:-1]
         logger.debug("Path to simulation: %s", self.sim_path)
         logger.debug("Simulation file: %s", self.sim_file)
-        # Check if the path is a directory and if the file exists
-        if not self.sim_path.exists() or not (self.sim_path / self.sim_file).exists():
-            error_msg = (
-                f"Simulation file '{self.sim_file}' not found in directory '{self.sim_path}'.")
-            raise FileNotFoundError(error_msg)
-        self._validate()
-
-    def _validate(self) -> None:
-        """Validate simulation path and file."""
-        if not self.sim_path.is_dir():
-            raise FileNotFoundError(f"Directory not found: {self.sim_path}")
-        if not (self.sim_path / self.sim_file).exists():
-            raise FileNotFoundError(f"File not found: {self.sim_file}")
 
     def _start_matlab(self) -> None:
         """Start MATLAB process with subprocess."""
         command = [
-            'matlab',
+            _matlab_executable(),
             '-batch',
             f"addpath('{self.sim_path}');"
             f"port = {self.connection.port};"
@@ -225,12 +529,20 @@ class MatlabStreamingController:
             f"run('{self.sim_file}');"
         ]
         try:
+            # An absolute executable path with close_fds=False lets subprocess
+            # launch MATLAB through posix_spawn instead of fork+exec, whose
+            # cost grows with the agent's memory footprint. Descriptors opened
+            # by Python are non-inheritable, so none leak into MATLAB. Setting
+            # close_fds, cwd, preexec_fn or start_new_session would silently
+            # fall back to fork.
             self.connection.matlab_process = subprocess.Popen(
                 command,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                text=True
+                bufsize=PIPE_BUFFER_SIZE,
+                close_fds=False
             )
+            self.connection.start_output_readers()
         except (subprocess.SubprocessError, Exception) as e:
             logger.error("Failed to start MATLAB process: %s", str(e))
             raise MatlabStreamingError(
@@ -240,13 +552,14 @@ class MatlabStreamingController:
         """Start streaming server and MATLAB process."""
         logger.debug("Starting streaming server for: %s", self.sim_file)
         try:
-            self.start_time = time.time()
+            self.start_time_ns = time.monotonic_ns()
             self.connection.start_server()
             logger.debug(
                 "Server started on %s:%d",
                 self.connection.host,
                 self.connection.port)
             self._start_matlab()
+            self._start_sampler()
             # Record MATLAB startup complete
             performance_monitor.record_matlab_startup_complete()
             logger.debug("MATLAB process started")
@@ -270,22 +583,126 @@ class MatlabStreamingController:
 
     def _process_output(self, output: Dict[str, Any], sequence: int) -> None:
         """Process and send individual output chunk."""
-        template_type = 'progress' if 'progress' in output else 'streaming'
-        data_payload = output if template_type == 'streaming' else output.get('data', {
-        })
-        response = create_response(
-            template_type,
-            self.sim_file,
-            'streaming',
-            self.response_templates,
-            percentage=output.get('progress', {}).get('percentage', sequence),
-            data=data_payload,
-            metadata=output.get('metadata', {}),
-            sequence=sequence,
-            bridge_meta=self.bridge_meta,
-            request_id=self.request_id,
-        )
-        self.message_broker.send_result(self.source, response)
+        if 'progress' in output:
+            percentage = output['progress'].get('percentage', sequence)
+            response = self._make_progress(
+                percentage=percentage,
+                data=output.get('data', {}),
+                metadata=output.get('metadata', {}),
+                sequence=sequence
+            )
+            self._publish(response, final=isinstance(
+                percentage, (int, float)) and percentage >= 100,
+                key=('progress',) if self.coalesce else None)
+        else:
+            response = self._make_streaming(
+                data=output,
+                metadata=output.get('metadata', {}),
+                sequence=sequence
+            )
+            self._publish(response, key=self._signal_key(output))
+
+    def _signal_key(self, output: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+        """
+        Return the coalescing key of a single named numeric value, or None
+        for outputs that must all be delivered.
+        """
+        if not self.coalesce or len(output) != 1:
+            return None
+        name, value = next(iter(output.items()))
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return ('streaming', name)
+        return None
+
+    def _publish(
+            self,
+            response: Dict[str, Any],
+            final: bool = False,
+            key: Optional[Tuple[str, ...]] = None) -> None:
+        """
+        Send a response, or add it to the pending batch.
+
+        A response with a key replaces the pending one with the same key;
+        it moves to the end so the batch stays in sequence order.
+        """
+        if self.batch_size == 1:
+            self.message_broker.send_result(self.source, response)
+            return
+        if not self._batch:
+            self._batch_deadline = time.monotonic() + self.batch_delay
+        if key is None:
+            key = response['sequence']
+        self._batch.pop(key, None)
+        self._batch[key] = response
+        if (final or len(self._batch) >= self.batch_size
+                or time.monotonic() >= self._batch_deadline):
+            self._flush_batch()
+
+    def _flush_batch(self) -> None:
+        """Publish the pending batch, if any, as a single message."""
+        if self._batch:
+            self.message_broker.send_results(
+                self.source, list(self._batch.values()))
+            self._batch = {}
+
+    def _wait_for_data(self) -> None:
+        """
+        Block until MATLAB sends more data, flushing the pending batch if
+        its delay expires first.
+        """
+        if self._batch:
+            timeout = max(0.0, self._batch_deadline - time.monotonic())
+            # A selector rather than select.select, which cannot watch
+            # descriptors past FD_SETSIZE in agents holding many sockets
+            with selectors.DefaultSelector() as selector:
+                selector.register(
+                    self.connection.connection, selectors.EVENT_READ)
+                readable = selector.select(timeout)
+            if not readable:
+                self._flush_batch()
+
+    def _forward_raw_output(
+            self, line: bytes, output: Any, sequence: int) -> bool:
+        """
+        Publish a plain JSON object line as received, without re-encoding.
+
+        The line must already have been decoded into output, so only valid
+        JSON is forwarded. Returns False for progress updates and for values
+        that are not objects, leaving them to the regular path.
+        """
+        if not isinstance(output, dict) or 'progress' in output:
+            return False
+        self._send_raw_output(line.strip(), sequence)
+        return True
+
+    def _forward_decoded_output(
+            self, output: Dict[str, Any], sequence: int) -> bool:
+        """
+        Publish a plain decoded output as JSON without building a response.
+
+        Returns False for progress updates and for outputs JSON cannot
+        represent (e.g. binary values), leaving them to the regular path.
+        """
+        if 'progress' in output:
+            return False
+        try:
+            data = _json_dumps(output)
+        except (TypeError, ValueError):
+            return False
+        self._send_raw_output(data, sequence)
+        return True
+
+    def _send_raw_output(self, data: bytes, sequence: int) -> None:
+        """Publish JSON-encoded output data inside the streaming response."""
+        timestamp = self._raw_timestamp()
+        # Keep batched outputs ahead of this one
+        self._flush_batch()
+        self.message_broker.send_raw_result(self.source, b''.join((
+            self._raw_prefix,
+            b', "timestamp": ', _json_dumps(timestamp),
+            b', "sequence": ', str(sequence).encode(),
+            b', "data": ', data, b'}'
+        )))
 
     def run(self, inputs: Dict[str, Any], performance_monitor) -> None:
         """Run simulation and handle streaming data."""
@@ -293,27 +710,12 @@ class MatlabStreamingController:
             logger.debug("Waiting for MATLAB connection...")
             self.connection.accept_connection()
             logger.debug("Sending inputs: %s", inputs)
-            self.connection.connection.sendall(
-                json.dumps(inputs).encode() + b'\n')
-
-            buffer = b""
-            sequence = 0
-            while True:
-                chunk = self.connection.connection.recv(4096)
-                if not chunk:
-                    logger.debug("Connection closed")
-                    break
-                buffer += chunk
-                while b'\n' in buffer:
-                    line, buffer = buffer.split(b'\n', 1)
-                    if line.strip():
-                        try:
-                            logger.debug("Received line: %s", line)
-                            self._process_output(
-                                json.loads(line.decode()), sequence)
-                            sequence += 1
-                        except json.JSONDecodeError as e:
-                            logger.warning("Invalid JSON: %s", str(e))
+            self.connection.connection.sendall(_json_line(inputs))
+
+            if self.wire_format == 'msgpack':
+                self._receive_msgpack()
+            else:
+                self._receive_json_lines()
             performance_monitor.record_simulation_complete()
         except socket.timeout as e:
             logger.error("Connection timeout: %s", str(e))
@@ -321,26 +723,156 @@ class MatlabStreamingController:
         except (ConnectionError, OSError) as e:
             logger.error("Connection error: %s", str(e))
             raise MatlabStreamingError(f"Connection error: {str(e)}") from e
+        finally:
+            self._flush_batch()
+
+    def _receive_json_lines(self) -> None:
+        """Process newline-delimited JSON outputs until MATLAB disconnects."""
+        buf = bytearray(RECV_BUFFER_SIZE)
+        view = memoryview(buf)
+        read_pos = write_pos = 0
+        sequence = 0
+        while True:
+            if write_pos == len(buf):
+                # No room left and no complete line pending: grow the
+                # buffer (the view must be released before resizing)
+                view.release()
+                buf.extend(bytes(len(buf)))
+                view = memoryview(buf)
+            self._wait_for_data()
+            with view[write_pos:] as free_space:
+                received = self.connection.connection.recv_into(
+                    free_space)
+            if not received:
+                logger.debug("Connection closed")
+                break
+            # Bytes before the ones just received hold no newline, so a
+            # long line is not rescanned on every read
+            scan_pos = write_pos
+            write_pos += received
+            newline = buf.find(b'\n', scan_pos, write_pos)
+            while newline != -1:
+                line_start, read_pos = read_pos, newline + 1
+                # Only non-blank lines are copied out of the buffer
+                if newline > line_start and not (
+                        line := buf[line_start:newline]).isspace():
+                    logger.debug("Received line: %s", line)
+                    try:
+                        output = _json_loads(line)
+                    except ValueError as e:
+                        # Malformed JSON, or NaN/Infinity from the fallback
+                        logger.warning("Invalid JSON: %s", str(e))
+                    else:
+                        if not (self.passthrough and self._forward_raw_output(
+                                line, output, sequence)):
+                            self._process_output(output, sequence)
+                        sequence += 1
+                newline = buf.find(b'\n', read_pos, write_pos)
+            if read_pos == write_pos:
+                read_pos = write_pos = 0
+            elif read_pos > write_pos // 2:
+                # Compact the pending partial line to the front
+                buf[:write_pos - read_pos] = buf[read_pos:write_pos]
+                write_pos -= read_pos
+                read_pos = 0
+
+    def _receive_msgpack(self) -> None:
+        """Process msgpack-encoded outputs until MATLAB disconnects."""
+        try:
+            import msgpack  # pylint: disable=import-outside-toplevel
+        except ImportError as e:
+            raise MatlabStreamingError(
+                "The msgpack wire format requires the 'msgpack' package") from e
+        unpacker = msgpack.Unpacker(
+            raw=False, max_buffer_size=MSGPACK_MAX_BUFFER_SIZE)
+        sequence = 0
+        while True:
+            self._wait_for_data()
+            chunk = self.connection.connection.recv(RECV_BUFFER_SIZE)
+            if not chunk:
+                logger.debug("Connection closed")
+                break
+            unpacker.feed(chunk)
+            for output in unpacker:
+                if not isinstance(output, dict):
+                    logger.warning(
+                        "Ignoring msgpack message of type %s",
+                        type(output).__name__)
+                    continue
+                logger.debug("Received message: %s", output)
+                if not (self.passthrough and
+                        self._forward_decoded_output(output, sequence)):
+                    self._process_output(output, sequence)
+                sequence += 1
 
     def get_metadata(self) -> Dict[str, Any]:
-        """Collect system resource metadata."""
-        metadata = {'execution_time': time.time(
-        ) - self.start_time} if self.start_time else {}
-        process = psutil.Process(os.getpid())
-        metadata['memory_usage'] = process.memory_info().rss // (1024 * 1024)
+        """
+        Collect system resource metadata.
+
+        While the simulation runs, resource usage comes from the snapshot
+        kept up to date by the sampling thread; otherwise it is sampled now.
+        """
+        metadata = {'execution_time': (
+            time.monotonic_ns() - self.start_time_ns) / 1e9
+        } if self.start_time_ns is not None else {}
+        if self._sampler is not None:
+            metadata.update(self._resource_snapshot)
+        else:
+            metadata.update(self._sample_resources())
+        return metadata
 
-        if self.connection.matlab_process:
+    def _sample_resources(self) -> Dict[str, Any]:
+        """Measure agent and MATLAB memory/CPU usage."""
+        if self._agent_process is None:
+            self._agent_process = psutil.Process(os.getpid())
+        snapshot = {
+            'memory_usage':
+                self._agent_process.memory_info().rss // (1024 * 1024)
+        }
+
+        matlab_process = self.connection.matlab_process
+        if matlab_process:
             try:
-                matlab_proc = psutil.Process(
-                    self.connection.matlab_process.pid)
-                metadata.update({'matlab_memory': matlab_proc.memory_info(
-                ).rss // (1024 * 1024), 'matlab_cpu': matlab_proc.cpu_percent()})
+                if (self._matlab_process is None
+                        or self._matlab_process.pid != matlab_process.pid):
+                    self._matlab_process = psutil.Process(matlab_process.pid)
+                cpu_times = self._matlab_process.cpu_times()
+                # Average usage since MATLAB started; unlike cpu_percent()
+                # this needs no earlier sample, so the first one is valid
+                elapsed = time.time() - self._matlab_process.create_time()
+                snapshot.update({
+                    'matlab_memory':
+                        self._matlab_process.memory_info().rss // (1024 * 1024),
+                    'matlab_cpu': round(
+                        100 * (cpu_times.user + cpu_times.system) / elapsed, 1
+                    ) if elapsed > 0 else 0.0
+                })
             except psutil.NoSuchProcess:
                 pass
-        return metadata
+        return snapshot
+
+    def _start_sampler(self) -> None:
+        """Start refreshing the resource snapshot in the background."""
+        self._resource_snapshot = self._sample_resources()
+        self._stop_sampling.clear()
+        self._sampler = threading.Thread(
+            target=self._sample_loop, daemon=True)
+        self._sampler.start()
+
+    def _sample_loop(self) -> None:
+        """Refresh the resource snapshot until the controller is closed."""
+        while not self._stop_sampling.wait(METADATA_SAMPLE_INTERVAL):
+            try:
+                self._resource_snapshot = self._sample_resources()
+            except psutil.Error as e:
+                logger.debug("Resource sampling failed: %s", e)
 
     def close(self) -> None:
         """Clean up resources."""
+        if self._sampler is not None:
+            self._stop_sampling.set()
+            self._sampler.join()
+            self._sampler = None
         self.connection.close()
 
 
@@ -382,6 +914,7 @@ def _handle_streaming_error(
                 'message': str(error),
                 'type': error_type,
                 'code': 400 if error_type == 'bad_request' else 500,
-                'traceback': sys.exc_info() if response_templates.get(
+                'traceback': ''.join(traceback.format_exception(error))
+                if response_templates.get(
                     'error',
                     {}).get('include_stacktrace') else None}))
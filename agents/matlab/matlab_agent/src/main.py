@@ -1,35 +1,65 @@
 """
 Main entry point for the MATLAB Agent application.
 """
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import sys
 from pathlib import Path
-import logging
-import click
-from .utils.logger import setup_logger
-from .interfaces.agent import IMatlabAgent
-from .core.agent import MatlabAgent
-from .utils.config_loader import load_config
-
-
-@click.command()
-@click.option('--config-file', '-c', type=click.Path(exists=True),
-              default=None, help='Path to custom configuration file')
-@click.option('--generate-config', is_flag=True,
-              help='Generate a default configuration file in the current directory')
-@click.option('--generate-project', is_flag=True,
-              help='Generate default project files in the current directory')
-def main(config_file=None, generate_config=False,
-         generate_project=False) -> None:
+from typing import TYPE_CHECKING, List, Optional
+
+if TYPE_CHECKING:
+    import logging
+    from .interfaces.agent import IMatlabAgent
+
+
+def _existing_file(path: str) -> str:
+    """Argument type accepting only paths to existing files."""
+    if not os.path.isfile(path):
+        raise argparse.ArgumentTypeError(f"Path '{path}' does not exist.")
+    return path
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser of the agent."""
+    parser = argparse.ArgumentParser(
+        prog='matlab-agent',
+        description='An agent service to manage Matlab simulations.')
+    parser.add_argument('--config-file', '-c', type=_existing_file,
+                        default=None,
+                        help='Path to custom configuration file')
+    parser.add_argument('--generate-config', action='store_true',
+                        help='Generate a default configuration file in the current directory')
+    parser.add_argument('--generate-project', action='store_true',
+                        help='Generate default project files in the current directory')
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
     """
     An agent service to manage Matlab simulations.
     """
-    if generate_config:
+    if argv is None:
+        argv = sys.argv[1:]
+    # The generators only copy packaged templates: a lone generator flag
+    # needs no parser
+    if argv == ['--generate-config']:
         generate_default_config()
         return
-    if generate_project:
+    if argv == ['--generate-project']:
         generate_default_project()
         return
-    if config_file:
-        run_agent(config_file)
+    args = _build_parser().parse_args(argv)
+    if args.generate_config:
+        generate_default_config()
+        return
+    if args.generate_project:
+        generate_default_project()
+        return
+    if args.config_file:
+        run_agent(args.config_file)
     else:
         config_path = Path('config.yaml')
         if not config_path.exists():
@@ -50,25 +80,23 @@ matlab-agent --config-file /path/to/your/config.yaml
             run_agent(str(config_path))
 
 
+def _copy_resource(package: str, resource_name: str, destination: Path) -> None:
+    """Copy a file shipped inside a package to the given destination."""
+    from importlib.resources import as_file, files
+    # copyfile uses the kernel's sendfile fast path between regular files
+    with as_file(files(package).joinpath(resource_name)) as source:
+        shutil.copyfile(source, destination)
+
+
 def generate_default_config():
     """Copy the template configuration file to the current directory if not already present."""
-    config_path = Path.cwd() / 'config.yaml'
+    config_path = Path('config.yaml')
     if config_path.exists():
         print(f"File already exists at path: {config_path}")
         return
     try:
-        try:
-            from importlib.resources import files
-            template_path = files('matlab_agent.config').joinpath(
-                'config.yaml.template')
-            with open(template_path, 'rb') as src, open(config_path, 'wb') as dst:
-                dst.write(src.read())
-        except (ImportError, AttributeError):
-            import pkg_resources
-            template_content = pkg_resources.resource_string('matlab_agent.config',
-                                                             'config.yaml.template')
-            with open(config_path, 'wb') as dst:
-                dst.write(template_content)
+        _copy_resource('matlab_agent.config', 'config.yaml.template',
+                       config_path)
         print(f"Configuration template copied to: {config_path}")
     except FileNotFoundError:
         print("Error: Template configuration file not found.")
@@ -110,31 +138,13 @@ def generate_default_project():
         # Ensure client directory exists
         Path("client").mkdir(parents=True, exist_ok=True)
 
-        try:
-            from importlib.resources import files
-            for output_name, (package,
-                              resource_name) in files_to_generate.items():
-                output_path = Path(output_name)
-                if output_path.exists():
-                    existing_files.append(output_name)
-                    continue
-                resource_path = files(package).joinpath(resource_name)
-                with open(resource_path, 'rb') as src, open(output_path, 'wb') as dst:
-                    dst.write(src.read())
-                created_files.append(output_name)
-        except (ImportError, AttributeError):
-            import pkg_resources
-            for output_name, (package,
-                              resource_name) in files_to_generate.items():
-                output_path = Path(output_name)
-                if output_path.exists():
-                    existing_files.append(output_name)
-                    continue
-                template_content = pkg_resources.resource_string(
-                    package, resource_name)
-                with open(output_path, 'wb') as dst:
-                    dst.write(template_content)
-                created_files.append(output_name)
+        for output_name, (package, resource_name) in files_to_generate.items():
+            output_path = Path(output_name)
+            if output_path.exists():
+                existing_files.append(output_name)
+                continue
+            _copy_resource(package, resource_name, output_path)
+            created_files.append(output_name)
 
         # Print result summary
         print("\nProject generation summary:\n")
@@ -167,13 +177,20 @@ def generate_default_project():
 
 def run_agent(config_file):
     """Initializes and starts a single MATLAB agent instance."""
+    # Imported here so that --help, --generate-config and --generate-project
+    # do not pay for loading the broker client and MATLAB engine bindings
+    from .utils.logger import DEFAULT_LOG_LEVEL, LOG_LEVELS, setup_logger
+    from .core.agent import MatlabAgent
+    from .utils.config_loader import load_config
+
     broker_type = "rabbitmq"
     config = load_config(config_file)
     logging_level = config['logging']['level']
-    logging_file = config['logging']['file']
+    # An empty or missing file keeps logging on the console only
+    logging_file = config['logging'].get('file')
 
     logger: logging.Logger = setup_logger(
-        level=getattr(logging, logging_level.upper(), logging.INFO),
+        level=LOG_LEVELS.get(logging_level.upper(), DEFAULT_LOG_LEVEL),
         log_file=logging_file)
 
     agent_id = config['agent']['agent_id']
@@ -6,7 +6,8 @@ with support for environment variable substitution and validation.
 """
 
 import os
-from typing import Dict, Any, Optional, Union
+import re
+from typing import Dict, Any, Optional, Tuple, Union
 from pathlib import Path
 from importlib import resources
 import yaml
@@ -18,6 +19,15 @@ logger = get_logger()
 DEFAULT_CONFIG_PATH = Path(__file__).parent.parent / \
     "config" / "config.yaml.template"
 
+# libyaml-based loader when PyYAML was built with it
+_SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Environment variable reference: ${ENV_VAR} or ${ENV_VAR:default_value}
+_ENV_VAR_PATTERN = re.compile(r"\$\{([^}:]+)(?::([^}]*))?\}")
+
+# Parsed YAML files of this process, keyed on path, with their stat key
+_parsed_files: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+
 
 def get_base_dir() -> Path:
     """
@@ -69,7 +79,7 @@ def load_config(
         try:
             logger.debug("Loading default configuration file")
             with resources.open_text("matlab_agent.config", "config.yaml.template") as f:
-                config = yaml.safe_load(f)
+                config = yaml.load(f, Loader=_SafeLoader)
         except FileNotFoundError as exc:
             raise FileNotFoundError(
                 "Default configuration file not found inside the package."
@@ -77,16 +87,44 @@ def load_config(
     else:
         logger.debug("Loading configuration file from path: %s", config_path)
         config_file: Path = Path(config_path)
-        if not config_file.exists():
+        try:
+            config = _load_yaml_cached(config_file)
+        except FileNotFoundError as exc:
             raise FileNotFoundError(
-                f"Configuration file not found: {config_file}")
-        with open(config_file, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
+                f"Configuration file not found: {config_file}") from exc
     config = _substitute_env_vars(config)
 
     return config
 
 
+def _load_yaml_cached(config_file: Path) -> Any:
+    """
+    Parse a YAML file, reusing the content already parsed by this process
+    while the file is unchanged.
+
+    The parsed content is kept in memory only, keyed on the modification
+    time and size of the file. Environment variables are substituted after
+    loading (which copies the content), so the cache never holds resolved
+    values and callers never share mutable state.
+
+    Args:
+        config_file: Path to the YAML file
+
+    Returns:
+        Parsed content of the YAML file
+    """
+    stat = config_file.stat()
+    key: Tuple[int, int] = (stat.st_mtime_ns, stat.st_size)
+    parsed = _parsed_files.get(str(config_file))
+    if parsed is not None and parsed[0] == key:
+        return parsed[1]
+
+    with open(config_file, 'r', encoding='utf-8') as f:
+        config = yaml.load(f, Loader=_SafeLoader)
+    _parsed_files[str(config_file)] = (key, config)
+    return config
+
+
 def _substitute_env_vars(
     config: Union[Dict[str, Any], list, str]
 ) -> Union[Dict[str, Any], list, str]:
@@ -104,19 +142,9 @@ def _substitute_env_vars(
         return {k: _substitute_env_vars(v) for k, v in config.items()}
     if isinstance(config, list):
         return [_substitute_env_vars(item) for item in config]
-    if isinstance(config, str) and "${" in config and "}" in config:
-        start_idx: int = config.find("${")
-        end_idx: int = config.find("}", start_idx)
-        if start_idx != -1 and end_idx != -1:
-            env_var: str = config[start_idx + 2:end_idx]
-
-            if ":" in env_var:
-                env_name, default = env_var.split(":", 1)
-            else:
-                env_name, default = env_var, ""
-
-            env_value: str = os.environ.get(env_name, default)
-            return config[:start_idx] + env_value + config[end_idx + 1:]
+    if isinstance(config, str) and "${" in config:
+        return _ENV_VAR_PATTERN.sub(
+            lambda match: os.environ.get(match[1], match[2] or ""), config)
 
     return config
 
@@ -3,6 +3,7 @@ Configuration manager for the MATLAB Agent using Pydantic for validation.
 """
 
 from pathlib import Path
+from types import MappingProxyType
 from typing import Optional, Dict, Any, Literal
 from enum import Enum
 from pydantic import BaseModel, Field, ValidationError, ConfigDict
@@ -22,6 +23,87 @@ class LogLevel(str, Enum):
     CRITICAL = "CRITICAL"
 
 
+# Defaults of the container fields, copied for each Config
+_DEFAULT_METADATA_FIELDS = ("execution_time", "memory_usage", "matlab_version")
+_DEFAULT_ERROR_CODES = MappingProxyType({
+    "invalid_config": 400,
+    "matlab_start_failure": 500,
+    "execution_error": 500,
+    "timeout": 504,
+    "missing_file": 404
+})
+
+# Flat Config fields read from each nested section of the YAML configuration,
+# as (section path, ((flat key, nested key, default), ...))
+_FIELD_MAP = (
+    (("agent",), (
+        ("agent_id", "agent_id", "matlab"),
+    )),
+    (("rabbitmq",), (
+        ("rabbitmq_host", "host", "localhost"),
+        ("rabbitmq_port", "port", 5672),
+        ("rabbitmq_username", "username", "guest"),
+        ("rabbitmq_password", "password", "guest"),
+        ("rabbitmq_heartbeat", "heartbeat", 600),
+        ("rabbitmq_virtual_host", "vhost", "/"),
+    )),
+    (("simulation",), (
+        ("simulation_path", "path", "."),
+    )),
+    (("exchanges",), (
+        ("input_exchange", "input", "ex.bridge.output"),
+        ("output_exchange", "output", "ex.sim.result"),
+    )),
+    (("queue",), (
+        ("queue_durable", "durable", True),
+        ("queue_prefetch_count", "prefetch_count", 1),
+    )),
+    (("logging",), (
+        ("log_level", "level", LogLevel.INFO),
+        ("log_file", "file", "logs/matlab_agent.log"),
+    )),
+    (("performance",), (
+        ("performance_enabled", "enabled", False),
+        ("performance_log_dir", "log_dir", "performance_logs"),
+        ("performance_log_filename", "log_filename",
+         "performance_metrics.csv"),
+    )),
+    (("tcp",), (
+        ("tcp_host", "host", "localhost"),
+        ("tcp_port", "port", 5678),
+        ("tcp_wire_format", "wire_format", "json"),
+        ("tcp_passthrough", "passthrough", False),
+        ("tcp_batch_size", "batch_size", 1),
+        ("tcp_batch_delay_ms", "batch_delay_ms", 10),
+        ("tcp_coalesce", "coalesce", False),
+        ("tcp_recv_buffer_size", "recv_buffer_size", 1048576),
+    )),
+    (("response_templates", "success"), (
+        ("success_status", "status", "success"),
+        ("success_timestamp_format", "timestamp_format", "%Y-%m-%dT%H:%M:%SZ"),
+        ("success_include_metadata", "include_metadata", True),
+        ("success_metadata_fields", "metadata_fields",
+         _DEFAULT_METADATA_FIELDS),
+    )),
+    (("response_templates", "success", "simulation"), (
+        ("simulation_type", "type", "batch"),
+    )),
+    (("response_templates", "error"), (
+        ("error_status", "status", "error"),
+        ("error_include_stacktrace", "include_stacktrace", False),
+        ("error_timestamp_format", "timestamp_format", "%Y-%m-%dT%H:%M:%SZ"),
+        ("error_codes", "error_codes", _DEFAULT_ERROR_CODES),
+    )),
+    (("response_templates", "progress"), (
+        ("progress_status", "status", "in_progress"),
+        ("progress_include_percentage", "include_percentage", True),
+        ("progress_update_interval", "update_interval", 5),
+        ("progress_timestamp_format", "timestamp_format",
+         "%Y-%m-%dT%H:%M:%SZ"),
+    )),
+)
+
+
 class Config(BaseModel):
     """Main configuration model using Pydantic for validation."""
     model_config = ConfigDict(extra='ignore')
@@ -50,7 +132,7 @@ class Config(BaseModel):
 
     # Logging configuration
     log_level: LogLevel = Field(default=LogLevel.INFO)
-    log_file: str = Field(default="logs/matlab_agent.log")
+    log_file: Optional[str] = Field(default="logs/matlab_agent.log")
 
     # Performance configuration
     performance_enabled: bool = Field(default=False)
@@ -60,6 +142,12 @@ class Config(BaseModel):
     # TCP configuration
     tcp_host: str = Field(default="localhost")
     tcp_port: int = Field(default=5678)
+    tcp_wire_format: Literal["json", "msgpack"] = Field(default="json")
+    tcp_passthrough: bool = Field(default=False)
+    tcp_batch_size: int = Field(default=1, ge=1)
+    tcp_batch_delay_ms: int = Field(default=10, ge=0)
+    tcp_coalesce: bool = Field(default=False)
+    tcp_recv_buffer_size: int = Field(default=1048576, ge=0)
 
     # Response templates
     # Success template
@@ -68,7 +156,7 @@ class Config(BaseModel):
     success_timestamp_format: str = Field(default="%Y-%m-%dT%H:%M:%SZ")
     success_include_metadata: bool = Field(default=True)
     success_metadata_fields: list[str] = Field(
-        default=["execution_time", "memory_usage", "matlab_version"]
+        default_factory=lambda: list(_DEFAULT_METADATA_FIELDS)
     )
 
     # Error template
@@ -76,13 +164,7 @@ class Config(BaseModel):
     error_include_stacktrace: bool = Field(default=False)
     error_timestamp_format: str = Field(default="%Y-%m-%dT%H:%M:%SZ")
     error_codes: Dict[str, int] = Field(
-        default={
-            "invalid_config": 400,
-            "matlab_start_failure": 500,
-            "execution_error": 500,
-            "timeout": 504,
-            "missing_file": 404
-        }
+        default_factory=lambda: dict(_DEFAULT_ERROR_CODES)
     )
 
     # Progress template
@@ -127,7 +209,13 @@ class Config(BaseModel):
             },
             "tcp": {
                 "host": self.tcp_host,
-                "port": self.tcp_port
+                "port": self.tcp_port,
+                "wire_format": self.tcp_wire_format,
+                "passthrough": self.tcp_passthrough,
+                "batch_size": self.tcp_batch_size,
+                "batch_delay_ms": self.tcp_batch_delay_ms,
+                "coalesce": self.tcp_coalesce,
+                "recv_buffer_size": self.tcp_recv_buffer_size
             },
             "response_templates": {
                 "success": {
@@ -157,105 +245,17 @@ class Config(BaseModel):
     @classmethod
     def from_dict(cls, config_dict: Dict[str, Any]) -> 'Config':
         """Create a Config instance from a nested dictionary."""
-        # Extract values from nested structure
+        # Extract values from nested structure; a section only contributes
+        # its fields when every level of its path is present
         flat_config = {}
-
-        # Extract agent section if present
-        if agent := config_dict.get("agent", {}):
-            flat_config["agent_id"] = agent.get("agent_id", "matlab")
-
-        # Extract rabbitmq section if present
-        if rabbitmq := config_dict.get("rabbitmq", {}):
-            flat_config["rabbitmq_host"] = rabbitmq.get("host", "localhost")
-            flat_config["rabbitmq_port"] = rabbitmq.get("port", 5672)
-            flat_config["rabbitmq_username"] = rabbitmq.get(
-                "username", "guest")
-            flat_config["rabbitmq_password"] = rabbitmq.get(
-                "password", "guest")
-            flat_config["rabbitmq_heartbeat"] = rabbitmq.get("heartbeat", 600)
-            flat_config["rabbitmq_virtual_host"] = rabbitmq.get(
-                "vhost", "/")
-
-        if simulation := config_dict.get("simulation", {}):
-            flat_config["simulation_path"] = simulation.get(
-                "path", ".")
-
-        # Extract exchanges section if present
-        if exchanges := config_dict.get("exchanges", {}):
-            flat_config["input_exchange"] = exchanges.get(
-                "input", "ex.bridge.output")
-            flat_config["output_exchange"] = exchanges.get(
-                "output", "ex.sim.result")
-
-        # Extract queue section if present
-        if queue := config_dict.get("queue", {}):
-            flat_config["queue_durable"] = queue.get("durable", True)
-            flat_config["queue_prefetch_count"] = queue.get(
-                "prefetch_count", 1)
-
-        # Extract logging section if present
-        if logging := config_dict.get("logging", {}):
-            flat_config["log_level"] = logging.get("level", LogLevel.INFO)
-            flat_config["log_file"] = logging.get(
-                "file", "logs/matlab_agent.log")
-
-        # Extract performance section if present
-        if performance := config_dict.get("performance", {}):
-            flat_config["performance_enabled"] = performance.get(
-                "enabled", False)
-            flat_config["performance_log_dir"] = performance.get(
-                "log_dir", "performance_logs")
-            flat_config["performance_log_filename"] = performance.get(
-                "log_filename", "performance_metrics.csv")
-
-        # Extract tcp section if present
-        if tcp := config_dict.get("tcp", {}):
-            flat_config["tcp_host"] = tcp.get("host", "localhost")
-            flat_config["tcp_port"] = tcp.get("port", 5678)
-
-        # Extract response_templates section if present
-        if templates := config_dict.get("response_templates", {}):
-            # Success template
-            if success := templates.get("success", {}):
-                flat_config["success_status"] = success.get(
-                    "status", "success")
-                if simulation := success.get("simulation", {}):
-                    flat_config["simulation_type"] = simulation.get(
-                        "type", "batch")
-                flat_config["success_timestamp_format"] = success.get(
-                    "timestamp_format", "%Y-%m-%dT%H:%M:%SZ")
-                flat_config["success_include_metadata"] = success.get(
-                    "include_metadata", True)
-                flat_config["success_metadata_fields"] = success.get("metadata_fields",
-                                                                     ["execution_time",
-                                                                      "memory_usage",
-                                                                      "matlab_version"])
-
-            # Error template
-            if error := templates.get("error", {}):
-                flat_config["error_status"] = error.get("status", "error")
-                flat_config["error_include_stacktrace"] = error.get(
-                    "include_stacktrace", False)
-                flat_config["error_timestamp_format"] = error.get(
-                    "timestamp_format", "%Y-%m-%dT%H:%M:%SZ")
-                flat_config["error_codes"] = error.get("error_codes", {
-                    "invalid_config": 400,
-                    "matlab_start_failure": 500,
-                    "execution_error": 500,
-                    "timeout": 504,
-                    "missing_file": 404
-                })
-
-            # Progress template
-            if progress := templates.get("progress", {}):
-                flat_config["progress_status"] = progress.get(
-                    "status", "in_progress")
-                flat_config["progress_include_percentage"] = progress.get(
-                    "include_percentage", True)
-                flat_config["progress_update_interval"] = progress.get(
-                    "update_interval", 5)
-                flat_config["progress_timestamp_format"] = progress.get(
-                    "timestamp_format", "%Y-%m-%dT%H:%M:%SZ")
+        for path, fields in _FIELD_MAP:
+            section = config_dict
+            for key in path:
+                if not (section := section.get(key, {})):
+                    break
+            else:
+                for flat_key, nested_key, default in fields:
+                    flat_config[flat_key] = section.get(nested_key, default)
 
         return cls(**flat_config)
 
@@ -9,8 +9,15 @@ Used by both batch and streaming simulation processors to ensure consistent
 response formatting across the simulation service.
 """
 
-from typing import Dict, Any
+import time
 from datetime import datetime
+from functools import lru_cache
+from typing import Callable, Dict, Any
+
+# Keyword arguments consumed by the template handlers rather than copied
+# into the response as-is
+_HANDLED_KEYS = frozenset({'outputs', 'data', 'error', 'metadata',
+                           'percentage', 'sequence', 'message'})
 
 
 def _handle_success_response(
@@ -84,6 +91,114 @@ def _handle_streaming_response(
         response['data'] = kwargs['data']
 
 
+@lru_cache(maxsize=None)
+def timestamp_formatter(timestamp_format: str) -> Callable[[], str]:
+    """
+    Return a function formatting the current local time.
+
+    Unless the format has sub-second fields, the formatted string only
+    changes once per second, so it is reused until the second changes.
+    One function is shared per format, so every response using the
+    format benefits.
+
+    Args:
+        timestamp_format: strftime format of the timestamps
+
+    Returns:
+        Function returning the current timestamp
+    """
+    if '%f' in timestamp_format:
+        return lambda: datetime.now().strftime(timestamp_format)
+
+    # Second and its formatted timestamp, replaced together so concurrent
+    # callers never pair a new second with an old string
+    cached = (-1, '')
+
+    def now() -> str:
+        nonlocal cached
+        second, formatted = cached
+        if int(time.time()) != second:
+            current = datetime.now()
+            formatted = current.strftime(timestamp_format)
+            cached = (int(current.timestamp()), formatted)
+        return formatted
+
+    return now
+
+
+def response_builder(
+    template_type: str,
+    sim_file: str,
+    sim_type: str,
+    response_templates: Dict[str, Any],
+    bridge_meta: str,
+    request_id: str
+) -> Callable[..., Dict[str, Any]]:
+    """
+    Return a function creating responses of a single template type.
+
+    The template is resolved once, so callers sending many responses of the
+    same type (e.g. streaming outputs) only pay for the per-message fields.
+
+    Args:
+        template_type: Type of template to use ('success', 'error', 'progress', 'streaming')
+        sim_file: Name of the simulation file
+        sim_type: Type of simulation ('batch' or 'streaming')
+        response_templates: Dictionary containing response template configurations
+
+    Returns:
+        Function taking the additional response fields as keyword arguments
+    """
+    template: Dict[str, Any] = response_templates.get(template_type, {})
+    status: str = (
+        'completed' if template_type == 'success'
+        else template.get('status', template_type)
+    )
+    timestamp = timestamp_formatter(template.get(
+        'timestamp_format', '%Y-%m-%dT%H:%M:%SZ'))
+    include_metadata: bool = template.get('include_metadata', False)
+
+    def build(**kwargs: Any) -> Dict[str, Any]:
+        response: Dict[str, Any] = {
+            'simulation': {
+                'name': sim_file,
+                'type': sim_type
+            },
+            'status': status,
+            'bridge_meta': bridge_meta,
+            'request_id': request_id,
+            'timestamp': timestamp()
+        }
+
+        # Add sequence number if available (for streaming)
+        if 'sequence' in kwargs:
+            response['sequence'] = kwargs['sequence']
+
+        # Add metadata if configured
+        if include_metadata and 'metadata' in kwargs:
+            response['metadata'] = kwargs['metadata']
+
+        # Template type specific fields, most frequent types first
+        if template_type == 'streaming':
+            _handle_streaming_response(response, kwargs)
+        elif template_type == 'progress':
+            _handle_progress_response(response, template, kwargs)
+        elif template_type == 'success':
+            _handle_success_response(response, sim_type, kwargs)
+        elif template_type == 'error':
+            _handle_error_response(response, template, kwargs)
+
+        # Add any additional keys passed in kwargs that aren't handled by
+        # specific cases
+        for key, value in kwargs.items():
+            if key not in _HANDLED_KEYS:
+                response[key] = value
+
+        return response
+
+    return build
+
+
 def create_response(
     template_type: str,
     sim_file: str,
@@ -106,54 +221,6 @@ def create_response(
     Returns:
         Formatted response dictionary
     """
-    template: Dict[str, Any] = response_templates.get(template_type, {})
-
-    # Create base response structure
-    response: Dict[str, Any] = {
-        'simulation': {
-            'name': sim_file,
-            'type': sim_type
-        },
-        'status': (
-            'completed' if template_type == 'success'
-            else template.get('status', template_type)
-        ),
-        'bridge_meta': bridge_meta,
-        'request_id': request_id
-    }
-
-    # Add timestamp according to configured format
-    timestamp_format: str = template.get(
-        'timestamp_format', '%Y-%m-%dT%H:%M:%SZ')
-    response['timestamp'] = datetime.now().strftime(timestamp_format)
-
-    # Add sequence number if available (for streaming)
-    if 'sequence' in kwargs:
-        response['sequence'] = kwargs['sequence']
-
-    # Add metadata if configured
-    if template.get('include_metadata', False) and 'metadata' in kwargs:
-        response['metadata'] = kwargs.get('metadata')
-
-    # Handle specific template types using helper functions
-    template_handlers = {
-        'success': lambda: _handle_success_response(response, sim_type, kwargs),
-        'error': lambda: _handle_error_response(response, template, kwargs),
-        'progress': lambda: _handle_progress_response(response, template, kwargs),
-        'streaming': lambda: _handle_streaming_response(response, kwargs)
-    }
-
-    # Execute the appropriate handler if it exists
-    handler = template_handlers.get(template_type)
-    if handler:
-        handler()
-
-    # Add any additional keys passed in kwargs that aren't handled by specific
-    # cases
-    excluded_keys = ['outputs', 'data', 'error',
-                     'metadata', 'percentage', 'sequence', 'message']
-    for key, value in kwargs.items():
-        if key not in excluded_keys:
-            response[key] = value
-
-    return response
+    return response_builder(
+        template_type, sim_file, sim_type, response_templates,
+        bridge_meta, request_id)(**kwargs)
@@ -3,34 +3,57 @@ This module provides utilities for configuring and managing loggers with support
 for file-based logging, console output, and optional colorized log messages.
 It ensures proper log file rotation and customizable logging formats.
 """
+import atexit
 import logging
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
-import colorlog
+from typing import Dict, Optional
 
 DEFAULT_LOG_FORMAT: str = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 DEFAULT_LOG_LEVEL: int = logging.INFO
 MAX_LOG_SIZE: int = 5 * 1024 * 1024  # 5 MB
 BACKUP_COUNT: int = 3
+# Logging levels accepted in the configuration file
+LOG_LEVELS: Dict[str, int] = {
+    'DEBUG': logging.DEBUG,
+    'INFO': logging.INFO,
+    'WARNING': logging.WARNING,
+    'ERROR': logging.ERROR,
+    'CRITICAL': logging.CRITICAL,
+}
+# Console output format, colorized when stdout is a terminal
+CONSOLE_LOG_FORMAT: str = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+CONSOLE_DATE_FORMAT: str = '%Y-%m-%d %H:%M:%S'
+
+# Thread and process details are not part of any log format used by the
+# agent, so skip collecting them for every record
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+
+# Background threads writing the log files, by logger name
+_file_listeners: Dict[str, QueueListener] = {}
 
 
 def setup_logger(
     name: str = 'MATLAB-AGENT',
     level: int = DEFAULT_LOG_LEVEL,
     log_format: str = DEFAULT_LOG_FORMAT,
-    log_file: str = 'logs/matlab-agent.log',
+    log_file: Optional[str] = 'logs/matlab-agent.log',
     enable_console: bool = True
 ) -> logging.Logger:
     """
     Configures a logger with handlers for file and console, with optional
-    colorization for console logs.
+    colorization for console logs. The log file is written by a background
+    thread until shutdown_logger is called or the process exits.
 
     Args:
         name: Name of the logger
         level: Logging level
         log_format: Format of the log messages
-        log_file: Path to the log file
+        log_file: Path to the log file, or None to log to the console only
         enable_console: Enables logging to the console
 
     Returns:
@@ -43,49 +66,84 @@ def setup_logger(
     if logger.handlers:
         return logger
 
-    # Ensure the log file directory exists
-    log_path: Path = Path(log_file)
-    log_path.parent.mkdir(parents=True, exist_ok=True)
-
-    # Configure file handler with rotation
-    file_handler: RotatingFileHandler = RotatingFileHandler(
-        filename=log_file,
-        maxBytes=MAX_LOG_SIZE,
-        backupCount=BACKUP_COUNT,
-        encoding='utf-8'
-    )
-    file_handler.setLevel(logging.DEBUG)
-    file_formatter: logging.Formatter = logging.Formatter(log_format)
-    file_handler.setFormatter(file_formatter)
-    logger.addHandler(file_handler)
-
-    # Configure console handler with color if enabled
+    if log_file:
+        # Ensure the log file directory exists
+        log_path: Path = Path(log_file)
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Configure file handler with rotation
+        file_handler: RotatingFileHandler = RotatingFileHandler(
+            filename=log_file,
+            maxBytes=MAX_LOG_SIZE,
+            backupCount=BACKUP_COUNT,
+            encoding='utf-8'
+        )
+        file_handler.setLevel(logging.DEBUG)
+        file_formatter: logging.Formatter = logging.Formatter(log_format)
+        file_handler.setFormatter(file_formatter)
+
+        # Write the file from a background thread so that logging calls
+        # never block on disk I/O or log rotation
+        shutdown_logger(name)
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        listener: QueueListener = QueueListener(
+            log_queue, file_handler, respect_handler_level=True)
+        listener.start()
+        _file_listeners[name] = listener
+        logger.addHandler(QueueHandler(log_queue))
+
+    # Configure console handler, with color when writing to a terminal
     if enable_console:
-        # Create a ColorFormatter for console logs
         console_handler: logging.StreamHandler = logging.StreamHandler(
             sys.stdout)
         console_handler.setLevel(level)
 
-        # Define a colorized log format for console output
-        console_format = '%(log_color)s%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        color_formatter = colorlog.ColoredFormatter(
-            console_format,
-            datefmt='%Y-%m-%d %H:%M:%S',
-            log_colors={
-                'DEBUG': 'cyan',
-                'INFO': 'green',
-                'WARNING': 'yellow',
-                'ERROR': 'red',
-                'CRITICAL': 'bold_red',
-            }
-        )
-
-        console_handler.setFormatter(color_formatter)
+        if sys.stdout.isatty():
+            # Imported here: colorlog is only needed on a terminal
+            import colorlog  # pylint: disable=import-outside-toplevel
+            console_formatter: logging.Formatter = colorlog.ColoredFormatter(
+                '%(log_color)s' + CONSOLE_LOG_FORMAT,
+                datefmt=CONSOLE_DATE_FORMAT,
+                log_colors={
+                    'DEBUG': 'cyan',
+                    'INFO': 'green',
+                    'WARNING': 'yellow',
+                    'ERROR': 'red',
+                    'CRITICAL': 'bold_red',
+                }
+            )
+        else:
+            # No colors when redirected to a file or pipe
+            console_formatter = logging.Formatter(
+                CONSOLE_LOG_FORMAT, datefmt=CONSOLE_DATE_FORMAT)
+
+        console_handler.setFormatter(console_formatter)
         logger.addHandler(console_handler)
 
     return logger
 
 
+def shutdown_logger(name: str = 'MATLAB-AGENT') -> None:
+    """
+    Writes any pending records to the log file of a logger and closes it.
+
+    Args:
+        name: Name of the logger
+    """
+    listener: Optional[QueueListener] = _file_listeners.pop(name, None)
+    if listener is not None:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+
+@atexit.register
+def _shutdown_loggers() -> None:
+    """Flushes the log files of all loggers when the process exits."""
+    for name in list(_file_listeners):
+        shutdown_logger(name)
+
+
 def get_logger(name: str = 'MATLAB-AGENT') -> logging.Logger:
     """
     Returns an instance of the already configured logger.
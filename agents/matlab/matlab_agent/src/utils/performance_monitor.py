@@ -1,12 +1,17 @@
 """
 Performance monitoring utilities for the MATLAB agent.
 """
+import atexit
 import csv
+import math
+import operator
 import os
+import threading
 import time
-from dataclasses import dataclass
+from collections import deque
+from dataclasses import dataclass, fields
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Deque, Dict, List, Optional, Any, TextIO
 
 import psutil
 
@@ -14,8 +19,11 @@ from ..utils.logger import get_logger
 
 logger = get_logger()
 
+# Completed operations kept in memory; the CSV file keeps all of them
+METRICS_HISTORY_LIMIT = 10000
 
-@dataclass
+
+@dataclass(slots=True)
 class PerformanceMetrics:
     """Data class to store performance metrics for a single operation."""
     operation_id: str
@@ -31,16 +39,32 @@ class PerformanceMetrics:
     total_duration: float
 
 
+# Values of a metrics record in the order of the CSV columns
+_csv_row = operator.attrgetter(
+    *(field.name for field in fields(PerformanceMetrics)))
+
+# Durations summarized by get_summary, as (summary key name, metrics field)
+_SUMMARY_FIELDS = (
+    ('startup', 'matlab_startup_duration'),
+    ('simulation', 'simulation_duration'),
+    ('total', 'total_duration'),
+)
+
+
 class PerformanceMonitor:
     """
     A class to monitor and collect performance metrics for the MATLAB agent.
     """
     _instance = None
     _initialized = False
+    # Serializes the first construction when several threads race for it
+    _lock = threading.Lock()
 
     def __new__(cls, *args, **kwargs):
         if cls._instance is None:
-            cls._instance = super(PerformanceMonitor, cls).__new__(cls)
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super(PerformanceMonitor, cls).__new__(cls)
         return cls._instance
 
     def __init__(self, config: Optional[Dict[str, Any]] = None):
@@ -50,51 +74,81 @@ class PerformanceMonitor:
         Args:
             config (Optional[Dict[str, Any]]): Configuration dictionary containing performance settings
         """
-        if not self._initialized:
-            self.enabled = False
-            self.output_dir = Path('performance_logs')
-            self.current_metrics = None
-            self.metrics_history = []
-            self.process = None
-            self.csv_path = None
-
-            if config:
-                perf_config = config.get('performance', {})
-                self.enabled = perf_config.get('enabled', False)
-                log_dir = perf_config.get('log_dir', 'performance_logs')
-                log_filename = perf_config.get(
-                    'log_filename', 'performance_metrics.csv')
-
-                if os.path.isabs(log_dir):
-                    self.output_dir = Path(log_dir)
-                else:
-                    self.output_dir = Path.cwd() / log_dir
-
-            if self.enabled:
-                try:
-                    self.output_dir.mkdir(parents=True, exist_ok=True)
-                    logger.debug(
-                        "Created performance log directory: %s",
-                        self.output_dir)
-
-                    self.process = psutil.Process()
-                    self.csv_path = self.output_dir / log_filename
-
-                    if not self.csv_path.exists():
-                        self._write_csv_headers()
-                        logger.debug(
-                            "Created performance metrics file: %s", self.csv_path)
-
-                    logger.debug("Performance monitoring enabled. Logs will be saved to %s",
-                                 self.output_dir)
-                except Exception as e:
-                    logger.error(
-                        "Failed to initialize performance monitoring: %s", e)
-                    self.enabled = False
+        if self._initialized:
+            return
+        with self._lock:
+            if not self._initialized:
+                self._setup(config)
+                self._initialized = True
+
+    def _setup(self, config: Optional[Dict[str, Any]]):
+        """
+        Set up monitoring from the configuration of the first construction.
+
+        Args:
+            config (Optional[Dict[str, Any]]): Configuration dictionary containing performance settings
+        """
+        self.enabled = False
+        self.output_dir = Path('performance_logs')
+        self.current_metrics = None
+        self.metrics_history: Deque[PerformanceMetrics] = deque(
+            maxlen=METRICS_HISTORY_LIMIT)
+        # Running [sum, min, max] of each summarized duration, so that the
+        # summary does not walk the history
+        self._operation_count = 0
+        self._duration_stats: Dict[str, List[float]] = {
+            name: [0.0, math.inf, -math.inf] for name, _ in _SUMMARY_FIELDS}
+        self.process = None
+        self.csv_path = None
+        # Monotonic clock readings the stage durations are measured
+        # from, unaffected by wall clock adjustments
+        self._request_clock = 0.0
+        self._matlab_start_clock = 0.0
+        # CSV file kept open while monitoring, closed at exit
+        self._csv_file: Optional[TextIO] = None
+        self._csv_writer = None
+
+        if config:
+            perf_config = config.get('performance', {})
+            self.enabled = perf_config.get('enabled', False)
+            log_dir = perf_config.get('log_dir', 'performance_logs')
+            log_filename = perf_config.get(
+                'log_filename', 'performance_metrics.csv')
+
+            if os.path.isabs(log_dir):
+                self.output_dir = Path(log_dir)
             else:
-                logger.debug("Performance monitoring is disabled")
+                self.output_dir = Path.cwd() / log_dir
+
+        if self.enabled:
+            try:
+                self.output_dir.mkdir(parents=True, exist_ok=True)
+                logger.debug(
+                    "Created performance log directory: %s",
+                    self.output_dir)
+
+                self.process = psutil.Process()
+                self.csv_path = self.output_dir / log_filename
+
+                new_file = not self.csv_path.exists()
+                self._csv_file = open(  # pylint: disable=consider-using-with
+                    self.csv_path, 'a', newline='', encoding='utf-8')
+                self._csv_writer = csv.writer(self._csv_file)
+                atexit.register(self.close)
+
+                if new_file:
+                    self._write_csv_headers()
+                    logger.debug(
+                        "Created performance metrics file: %s", self.csv_path)
 
-            self._initialized = True
+                logger.debug("Performance monitoring enabled. Logs will be saved to %s",
+                             self.output_dir)
+            except Exception as e:
+                logger.error(
+                    "Failed to initialize performance monitoring: %s", e)
+                self.enabled = False
+        else:
+            logger.debug("Performance monitoring is disabled")
 
     def _write_csv_headers(self):
         """Write CSV headers to the output file."""
@@ -102,21 +156,20 @@ class PerformanceMonitor:
             return
 
         try:
-            with open(self.csv_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow([
-                    'Operation ID',
-                    'Timestamp',
-                    'Request Received Time',
-                    'MATLAB Start Time',
-                    'MATLAB Startup Duration (s)',
-                    'Simulation Duration (s)',
-                    'MATLAB Stop Time',
-                    'Result Send Time',
-                    'CPU Usage (%)',
-                    'Memory RSS (MB)',
-                    'Total Duration (s)'
-                ])
+            self._csv_writer.writerow([
+                'Operation ID',
+                'Timestamp',
+                'Request Received Time',
+                'MATLAB Start Time',
+                'MATLAB Startup Duration (s)',
+                'Simulation Duration (s)',
+                'MATLAB Stop Time',
+                'Result Send Time',
+                'CPU Usage (%)',
+                'Memory RSS (MB)',
+                'Total Duration (s)'
+            ])
+            self._csv_file.flush()
         except Exception as e:
             logger.error("Failed to write CSV headers: %s", e)
             self.enabled = False
@@ -131,10 +184,12 @@ class PerformanceMonitor:
         if not self.enabled:
             return
 
+        now = time.time()
+        self._request_clock = self._matlab_start_clock = time.monotonic()
         self.current_metrics = PerformanceMetrics(
             operation_id=operation_id,
-            timestamp=time.time(),
-            request_received_time=time.time(),
+            timestamp=now,
+            request_received_time=now,
             matlab_start_time=0.0,
             matlab_startup_duration=0.0,
             simulation_duration=0.0,
@@ -152,6 +207,7 @@ class PerformanceMonitor:
             return
 
         self.current_metrics.matlab_start_time = time.time()
+        self._matlab_start_clock = time.monotonic()
         self._update_system_metrics()
 
     def record_matlab_startup_complete(self):
@@ -159,7 +215,7 @@ class PerformanceMonitor:
         if not self.enabled or not self.current_metrics:
             return
 
-        startup_duration = time.time() - self.current_metrics.matlab_start_time
+        startup_duration = time.monotonic() - self._matlab_start_clock
         self.current_metrics.matlab_startup_duration = startup_duration
         self._update_system_metrics()
         logger.debug("MATLAB startup duration: %.2fs", startup_duration)
@@ -170,7 +226,7 @@ class PerformanceMonitor:
             return
 
         self.current_metrics.simulation_duration = (
-            time.time() - self.current_metrics.matlab_start_time -
+            time.monotonic() - self._matlab_start_clock -
             self.current_metrics.matlab_startup_duration
         )
         self._update_system_metrics()
@@ -207,9 +263,10 @@ class PerformanceMonitor:
             return
 
         self.current_metrics.total_duration = (
-            time.time() - self.current_metrics.request_received_time
+            time.monotonic() - self._request_clock
         )
         self.metrics_history.append(self.current_metrics)
+        self._update_summary(self.current_metrics)
         self._save_metrics_to_csv(self.current_metrics)
         logger.debug(
             "Completed operation %s in %.2fs",
@@ -218,6 +275,21 @@ class PerformanceMonitor:
         )
         self.current_metrics = None
 
+    def _update_summary(self, metrics: PerformanceMetrics):
+        """
+        Add the durations of a completed operation to the running summary.
+
+        Args:
+            metrics (PerformanceMetrics): The metrics of the operation
+        """
+        self._operation_count += 1
+        for name, attribute in _SUMMARY_FIELDS:
+            value = getattr(metrics, attribute)
+            stats = self._duration_stats[name]
+            stats[0] += value
+            stats[1] = min(stats[1], value)
+            stats[2] = max(stats[2], value)
+
     def _save_metrics_to_csv(self, metrics: PerformanceMetrics):
         """
         Save metrics to CSV file.
@@ -228,21 +300,17 @@ class PerformanceMonitor:
         if not self.enabled:
             return
 
-        with open(self.csv_path, 'a', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow([
-                metrics.operation_id,
-                metrics.timestamp,
-                metrics.request_received_time,
-                metrics.matlab_start_time,
-                metrics.matlab_startup_duration,
-                metrics.simulation_duration,
-                metrics.matlab_stop_time,
-                metrics.result_send_time,
-                metrics.cpu_percent,
-                metrics.memory_rss_mb,
-                metrics.total_duration
-            ])
+        self._csv_writer.writerow(_csv_row(metrics))
+        # One write per operation keeps the file current without reopening
+        self._csv_file.flush()
+
+    def close(self):
+        """Close the CSV file once monitoring is over."""
+        if self._csv_file is not None:
+            self._csv_file.close()
+            self._csv_file = None
+            self._csv_writer = None
+            self.enabled = False
 
     def get_summary(self) -> Dict[str, float]:
         """
@@ -251,23 +319,13 @@ class PerformanceMonitor:
         Returns:
             Dict[str, float]: Summary statistics
         """
-        if not self.enabled or not self.metrics_history:
+        if not self.enabled or not self._operation_count:
             return {}
 
-        startup_times = [
-            m.matlab_startup_duration for m in self.metrics_history]
-        simulation_times = [m.simulation_duration for m in self.metrics_history]
-        total_times = [m.total_duration for m in self.metrics_history]
-
-        return {
-            'avg_startup_time': sum(startup_times) / len(startup_times),
-            'min_startup_time': min(startup_times),
-            'max_startup_time': max(startup_times),
-            'avg_simulation_time': sum(simulation_times) / len(simulation_times),
-            'min_simulation_time': min(simulation_times),
-            'max_simulation_time': max(simulation_times),
-            'avg_total_time': sum(total_times) / len(total_times),
-            'min_total_time': min(total_times),
-            'max_total_time': max(total_times),
-            'total_operations': len(self.metrics_history)
-        }
+        summary: Dict[str, float] = {}
+        for name, (total, minimum, maximum) in self._duration_stats.items():
+            summary[f'avg_{name}_time'] = total / self._operation_count
+            summary[f'min_{name}_time'] = minimum
+            summary[f'max_{name}_time'] = maximum
+        summary['total_operations'] = self._operation_count
+        return summary
@@ -141,9 +141,11 @@ class TestMatlabAgentOperations:
         mock_logger.exception.assert_called_once_with("Stack trace:")
 
     def test_stop(self, matlab_agent, mock_connect):  # pylint: disable=redefined-outer-name
-        """stop() calls comm.close()."""
-        matlab_agent.stop()
+        """stop() calls comm.close() and closes the streaming listeners."""
+        with mock.patch("src.core.agent.close_listeners") as mock_close:
+            matlab_agent.stop()
         mock_connect.close.assert_called_once()
+        mock_close.assert_called_once_with()
 
     def test_send_result(self, matlab_agent, mock_connect):  # pylint: disable=redefined-outer-name
         """send_result() delegates to comm.send_result."""
@@ -234,6 +234,7 @@ class TestSendResponse:
         response = {'status': 'completed', 'data': {'result': 42}}
 
         with patch('src.core.batch.yaml.dump') as mock_dump, \
+                patch('src.core.batch.logger.isEnabledFor', return_value=True), \
                 patch('src.core.batch.logger.debug') as mock_logger_debug:
 
             _send_response(broker_mock, 'test_queue', response)
@@ -242,6 +243,19 @@ class TestSendResponse:
         mock_dump.assert_called_once_with(response)
         mock_logger_debug.assert_called_once_with(mock_dump.return_value)
 
+    def test_send_response_skips_dump_without_debug(self):
+        """Test the response is not serialized when debug logging is off."""
+        broker_mock = Mock()
+        response = {'status': 'completed'}
+
+        with patch('src.core.batch.yaml.dump') as mock_dump, \
+                patch('src.core.batch.logger.isEnabledFor', return_value=False):
+
+            _send_response(broker_mock, 'test_queue', response)
+
+        broker_mock.send_result.assert_called_once_with('test_queue', response)
+        mock_dump.assert_not_called()
+
 
 class TestHandleError:
     """Tests for _handle_error function."""
@@ -177,6 +177,14 @@ class TestEnvironmentVariableSubstitution:
         # Cleanup
         os.environ.pop("TEST_VAR2", None)
 
+    def test_substitute_multiple_env_vars(self, monkeypatch):
+        """Test that every reference in a string is substituted."""
+        monkeypatch.setenv("TEST_HOST", "broker")
+        monkeypatch.delenv("TEST_PORT", raising=False)
+
+        result = _substitute_env_vars("amqp://${TEST_HOST}:${TEST_PORT:5672}/")
+        assert result == "amqp://broker:5672/"
+
     def test_env_substitution_in_config(self, tmp_path):
         """Test environment variable substitution when loading a config file."""
         # Create a test config with environment variables
@@ -200,6 +208,39 @@ class TestEnvironmentVariableSubstitution:
         # Cleanup
         os.environ.pop("HOST", None)
 
+    def test_load_config_writes_no_cache_file(self, tmp_path):
+        """Test that loading a file leaves its directory untouched."""
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("agent:\n  agent_id: cached\n")
+
+        assert load_config(str(config_file)) == {
+            "agent": {"agent_id": "cached"}}
+        assert [p.name for p in tmp_path.iterdir()] == ["config.yaml"]
+
+    def test_load_config_memoizes_parsed_file(self, tmp_path):
+        """Test that a file already loaded by the process is not read again."""
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("agent:\n  agent_id: memo\n")
+        first = load_config(str(config_file))
+
+        with patch('pathlib.Path.read_bytes') as mock_read, \
+                patch('yaml.load') as mock_yaml_load:
+            second = load_config(str(config_file))
+        mock_read.assert_not_called()
+        mock_yaml_load.assert_not_called()
+        assert second == first
+        assert second is not first
+
+    def test_load_config_invalidates_json_cache(self, tmp_path):
+        """Test that a modified file is parsed again."""
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("agent:\n  agent_id: old\n")
+        load_config(str(config_file))
+
+        config_file.write_text("agent:\n  agent_id: newer\n")
+        assert load_config(str(config_file)) == {
+            "agent": {"agent_id": "newer"}}
+
 
 class TestConfigValueRetrieval:
     """Tests for the get_config_value function."""
@@ -7,7 +7,7 @@ from unittest import mock
 import pytest
 from pydantic import ValidationError
 
-from src.utils.config_manager import ConfigManager
+from src.utils.config_manager import Config, ConfigManager
 
 
 @pytest.fixture
@@ -228,6 +228,29 @@ def test_validate_config_success():
         assert validated_config["agent"]["agent_id"] == "matlab"
 
 
+def test_config_from_dict_nested_sections():
+    """Test that nested sections are mapped onto the flat fields."""
+    config = Config.from_dict({
+        "tcp": {"port": 6000},
+        "response_templates": {
+            "success": {"simulation": {"type": "streaming"}},
+            "error": {"include_stacktrace": True}
+        }
+    })
+
+    assert config.tcp_port == 6000
+    assert config.tcp_host == "localhost"
+    assert config.simulation_type == "streaming"
+    assert config.error_include_stacktrace is True
+    assert config.error_codes["timeout"] == 504
+
+    # Defaults are copied, not shared between instances
+    config.success_metadata_fields.append("extra")
+    other = Config.from_dict({"response_templates": {"success": {
+        "status": "success"}}})
+    assert "extra" not in other.success_metadata_fields
+
+
 def test_validate_config_failure():
     """Test that validation error is raised with invalid data."""
     manager = ConfigManager()
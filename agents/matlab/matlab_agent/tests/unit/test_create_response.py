@@ -7,11 +7,14 @@ and response formatting.
 """
 
 import unittest
+from datetime import datetime
 from unittest.mock import patch
 from typing import Dict, Any
 
 from src.utils.create_response import (
     create_response,
+    response_builder,
+    timestamp_formatter,
     _handle_success_response,
     _handle_error_response,
     _handle_progress_response,
@@ -51,6 +54,8 @@ class TestCreateResponse(unittest.TestCase):
             }
         }
         self.sim_file = 'test_simulation.py'
+        # Timestamps are cached per format across calls
+        timestamp_formatter.cache_clear()
         self.bridge_meta = 'test_bridge_v1.0'
         self.request_id = 'req_123456'
 
@@ -330,6 +335,63 @@ class TestCreateResponse(unittest.TestCase):
         self.assertEqual(response['custom_field'], 'custom_value')
         self.assertEqual(response['another_field'], 42)
 
+    @patch('src.utils.create_response.datetime')
+    def test_response_builder_matches_create_response(self, mock_datetime):
+        """Test that a bound builder creates the same responses."""
+        mock_datetime.now.return_value.strftime.return_value = '2023-01-01T12:00:00Z'
+        build = response_builder(
+            'progress', self.sim_file, 'streaming', self.sample_templates,
+            self.bridge_meta, self.request_id)
+        for kwargs in ({'percentage': 10, 'data': {'x': 1}, 'sequence': 0},
+                       {'message': 'halfway', 'sequence': 1, 'extra': True}):
+            self.assertEqual(build(**kwargs), create_response(
+                'progress', self.sim_file, 'streaming', self.sample_templates,
+                self.bridge_meta, self.request_id, **kwargs))
+
+    def test_response_builder_returns_fresh_responses(self):
+        """Test that responses from one builder share no mutable state."""
+        build = response_builder(
+            'streaming', self.sim_file, 'streaming', self.sample_templates,
+            self.bridge_meta, self.request_id)
+        first = build(data={'a': 1}, sequence=0)
+        first['simulation']['name'] = 'changed'
+        second = build(data={'a': 2}, sequence=1)
+        self.assertEqual(second['simulation']['name'], self.sim_file)
+        self.assertEqual(second['data'], {'a': 2})
+
+    @patch('src.utils.create_response.time.time')
+    def test_timestamp_formatter_reuses_second(self, mock_time):
+        """Test that timestamps are only formatted again when the second changes."""
+        mock_time.return_value = 1700000000.2
+        with patch('src.utils.create_response.datetime') as mock_datetime:
+            mock_datetime.now.return_value.timestamp.return_value = 1700000000.2
+            mock_datetime.now.return_value.strftime.return_value = 'first'
+            timestamp = timestamp_formatter('%Y-%m-%dT%H:%M:%SZ')
+            self.assertEqual(timestamp(), 'first')
+            mock_time.return_value = 1700000000.9
+            self.assertEqual(timestamp(), 'first')
+            mock_datetime.now.assert_called_once()
+
+            mock_time.return_value = 1700000001.1
+            mock_datetime.now.return_value.timestamp.return_value = 1700000001.1
+            mock_datetime.now.return_value.strftime.return_value = 'second'
+            self.assertEqual(timestamp(), 'second')
+
+    def test_timestamp_formatter_uses_local_time(self):
+        """Test that cached timestamps match datetime.now()."""
+        timestamp_format = '%Y-%m-%dT%H:%M:%SZ'
+        before = datetime.now().strftime(timestamp_format)
+        value = timestamp_formatter(timestamp_format)()
+        after = datetime.now().strftime(timestamp_format)
+        self.assertIn(value, (before, after))
+
+    def test_timestamp_formatter_shared_per_format(self):
+        """Test that responses using the same format share one formatter."""
+        self.assertIs(timestamp_formatter('%H:%M:%S'),
+                      timestamp_formatter('%H:%M:%S'))
+        self.assertIsNot(timestamp_formatter('%H:%M:%S'),
+                         timestamp_formatter('%H:%M'))
+
     def test_handle_success_response_batch(self):
         """Test _handle_success_response for batch type."""
         response: Dict[str, Any] = {'simulation': {}}
@@ -11,6 +11,7 @@ import shutil
 import sys
 import tempfile
 import unittest
+from logging.handlers import QueueHandler
 from unittest.mock import patch
 
 import colorlog
@@ -22,7 +23,9 @@ from src.utils.logger import (
     MAX_LOG_SIZE,
     BACKUP_COUNT,
     setup_logger,
-    get_logger
+    shutdown_logger,
+    get_logger,
+    _file_listeners
 )
 
 
@@ -41,6 +44,7 @@ class TestLoggerSetup(unittest.TestCase):
 
     def tearDown(self):
         """Clean up after each test method."""
+        shutdown_logger(self.logger_name)
         # Remove all handlers from test logger
         test_logger = logging.getLogger(self.logger_name)
         for handler in test_logger.handlers[:]:
@@ -69,6 +73,7 @@ class TestLoggerSetup(unittest.TestCase):
             self.assertEqual(len(logger.handlers), 2)  # File + Console handlers
 
             # Close handlers before removing temp directory
+            shutdown_logger(self.logger_name)
             for handler in logger.handlers[:]:
                 handler.close()
                 logger.removeHandler(handler)
@@ -111,8 +116,11 @@ class TestLoggerSetup(unittest.TestCase):
             log_file=self.test_log_file
         )
 
+        self.assertTrue(any(
+            isinstance(h, QueueHandler) for h in logger.handlers))
+
         file_handler = None
-        for handler in logger.handlers:
+        for handler in _file_listeners[self.logger_name].handlers:
             if isinstance(handler, logging.handlers.RotatingFileHandler):
                 file_handler = handler
                 break
@@ -122,7 +130,8 @@ class TestLoggerSetup(unittest.TestCase):
         self.assertEqual(file_handler.backupCount, BACKUP_COUNT)
         self.assertEqual(file_handler.level, logging.DEBUG)
 
-    def test_console_handler_configuration(self):
+    @patch.object(sys.stdout, 'isatty', return_value=True)
+    def test_console_handler_configuration(self, _mock_isatty):
         """Test console handler configuration."""
         logger = setup_logger(
             name=self.logger_name,
@@ -143,6 +152,19 @@ class TestLoggerSetup(unittest.TestCase):
             console_handler.formatter,
             colorlog.ColoredFormatter)
 
+    @patch.object(sys.stdout, 'isatty', return_value=False)
+    def test_console_without_terminal_is_plain(self, _mock_isatty):
+        """Test that console output is not colorized when redirected."""
+        logger = setup_logger(
+            name=self.logger_name,
+            log_file=None,
+            enable_console=True
+        )
+
+        formatter = logger.handlers[0].formatter
+        self.assertNotIsInstance(formatter, colorlog.ColoredFormatter)
+        self.assertEqual(formatter.datefmt, '%Y-%m-%d %H:%M:%S')
+
     def test_console_disabled(self):
         """Test logger setup with console disabled."""
         logger = setup_logger(
@@ -158,6 +180,15 @@ class TestLoggerSetup(unittest.TestCase):
 
         self.assertEqual(len(console_handlers), 0)
 
+    def test_file_disabled(self):
+        """Test logger setup without a log file."""
+        logger = setup_logger(name=self.logger_name, log_file=None)
+
+        self.assertFalse(any(
+            isinstance(h, QueueHandler) for h in logger.handlers))
+        self.assertNotIn(self.logger_name, _file_listeners)
+        self.assertEqual(len(logger.handlers), 1)
+
     def test_logger_already_configured(self):
         """Test that existing logger handlers are preserved."""
         # Set up logger first time
@@ -176,7 +207,8 @@ class TestLoggerSetup(unittest.TestCase):
         self.assertIs(logger1, logger2)
         self.assertEqual(len(logger2.handlers), initial_handler_count)
 
-    def test_color_formatter_configuration(self):
+    @patch.object(sys.stdout, 'isatty', return_value=True)
+    def test_color_formatter_configuration(self, _mock_isatty):
         """Test color formatter configuration."""
         logger = setup_logger(
             name=self.logger_name,
@@ -225,6 +257,7 @@ class TestLoggerSetup(unittest.TestCase):
 
         test_message = "Test log message"
         logger.info(test_message)
+        shutdown_logger(self.logger_name)
 
         # Check if log file was created and contains the message
         self.assertTrue(os.path.exists(self.test_log_file))
@@ -247,6 +280,7 @@ class TestLoggerSetup(unittest.TestCase):
         logger.warning("Warning message")
         logger.error("Error message")
         logger.critical("Critical message")
+        shutdown_logger(self.logger_name)
 
         with open(self.test_log_file, 'r', encoding='utf-8') as f:
             log_content = f.read()
@@ -318,6 +352,7 @@ class TestLogRotation(unittest.TestCase):
 
     def tearDown(self):
         """Clean up after each test method."""
+        shutdown_logger(self.logger_name)
         test_logger = logging.getLogger(self.logger_name)
         for handler in test_logger.handlers[:]:
             handler.close()
@@ -340,10 +375,8 @@ class TestLogRotation(unittest.TestCase):
         for _ in range(5):  # Should exceed 100 bytes
             logger.info(large_message)
 
-        # Force handler to flush
-        for handler in logger.handlers:
-            if hasattr(handler, 'flush'):
-                handler.flush()
+        # Write pending records
+        shutdown_logger(self.logger_name)
 
         # Check if rotation files might exist (implementation dependent)
         self.assertTrue(os.path.exists(self.test_log_file))
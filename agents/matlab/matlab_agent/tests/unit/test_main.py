@@ -4,10 +4,12 @@ Tests all functions including CLI commands, file generation, and error handling.
 Fixed version addressing pkg_resources and assertion issues.
 """
 import logging
+import subprocess
+import sys
 from pathlib import Path
-from unittest.mock import MagicMock, patch, mock_open, call
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch, call
 import pytest
-from click.testing import CliRunner
 
 from src.main import (
     main,
@@ -61,16 +63,25 @@ class TestMainFunction:
         return agent
 
     @pytest.fixture
-    def cli_runner(self):
-        """Click CLI runner fixture for testing command-line interface."""
-        return CliRunner()
+    def run_cli(self, capsys):
+        """Run the command-line interface capturing exit code and output."""
+        def invoke(args):
+            try:
+                main(args)
+                exit_code = 0
+            except SystemExit as e:
+                exit_code = e.code
+            captured = capsys.readouterr()
+            return SimpleNamespace(exit_code=exit_code,
+                                   output=captured.out + captured.err)
+        return invoke
 
     @pytest.fixture
     def mock_dependencies(self, mock_agent):
         """Mock all external dependencies for isolated testing."""
-        with patch('src.main.MatlabAgent') as mock_matlab_agent, \
-                patch('src.main.setup_logger') as mock_setup_logger, \
-                patch('src.main.load_config') as mock_load_config:
+        with patch('src.core.agent.MatlabAgent') as mock_matlab_agent, \
+                patch('src.utils.logger.setup_logger') as mock_setup_logger, \
+                patch('src.utils.config_loader.load_config') as mock_load_config:
 
             # Setup mock logger with all required methods
             mock_logger = MagicMock()
@@ -83,22 +94,31 @@ class TestMainFunction:
             yield mock_matlab_agent, mock_setup_logger, mock_load_config, mock_logger
 
     # Test CLI flag options
-    def test_generate_config_flag(self, cli_runner):
+    def test_generate_config_flag(self, run_cli):
         """Test --generate-config flag calls the correct function."""
         with patch('src.main.generate_default_config') as mock_gen_conf:
-            result = cli_runner.invoke(main, ['--generate-config'])
+            result = run_cli(['--generate-config'])
             mock_gen_conf.assert_called_once()
             assert result.exit_code == 0
 
-    def test_generate_project_flag(self, cli_runner):
+    def test_generate_project_flag(self, run_cli):
         """Test --generate-project flag calls the correct function."""
         with patch('src.main.generate_default_project') as mock_gen_proj:
-            result = cli_runner.invoke(main, ['--generate-project'])
+            result = run_cli(['--generate-project'])
             mock_gen_proj.assert_called_once()
             assert result.exit_code == 0
 
+    def test_generate_flag_skips_parser(self):
+        """Test a lone generator flag does not build the argument parser."""
+        with patch('src.main.generate_default_config') as mock_gen_conf, \
+                patch('src.main._build_parser') as mock_parser, \
+                patch('sys.argv', ['matlab-agent', '--generate-config']):
+            main()
+            mock_gen_conf.assert_called_once()
+            mock_parser.assert_not_called()
+
     # Test main function with config file
-    def test_main_with_config_file(self, cli_runner, mock_dependencies):
+    def test_main_with_config_file(self, run_cli, mock_dependencies):
         """Test main function with explicitly provided config file."""
         mock_matlab_agent, mock_setup_logger, mock_load_config, mock_logger = mock_dependencies
 
@@ -108,7 +128,7 @@ class TestMainFunction:
         }
 
         config_path = Path('matlab_agent/config/config.yaml.template').resolve()
-        result = cli_runner.invoke(main, ['-c', str(config_path)])
+        result = run_cli(['-c', str(config_path)])
 
         mock_load_config.assert_called_once_with(str(config_path))
         mock_matlab_agent.assert_called_once_with(
@@ -121,13 +141,13 @@ class TestMainFunction:
         assert result.exit_code == 0
 
     def test_main_without_config_file_exists(
-            self, cli_runner, mock_dependencies, default_config):
+            self, run_cli, mock_dependencies, default_config):
         """Test main function when config.yaml exists in current directory."""
         mock_matlab_agent, mock_setup_logger, mock_load_config, mock_logger = mock_dependencies
 
         with patch('pathlib.Path.exists', return_value=True):
             mock_load_config.return_value = default_config
-            result = cli_runner.invoke(main, [])
+            result = run_cli([])
 
             mock_load_config.assert_called_once_with('config.yaml')
             mock_matlab_agent.assert_called_once_with(
@@ -139,20 +159,20 @@ class TestMainFunction:
             mock_agent.start.assert_called_once()
             assert result.exit_code == 0
 
-    def test_main_without_config_file_missing(self, cli_runner):
+    def test_main_without_config_file_missing(self, run_cli):
         """Test main function when config.yaml is missing."""
         with patch('pathlib.Path.exists', return_value=False):
-            result = cli_runner.invoke(main, [])
+            result = run_cli([])
             assert "Error: Configuration file 'config.yaml' not found." in result.output
             assert "matlab-agent --generate-config" in result.output
             assert result.exit_code == 0
 
     # Test error handling in main function
-    def test_main_keyboard_interrupt(self, cli_runner, default_config):
+    def test_main_keyboard_interrupt(self, run_cli, default_config):
         """Test graceful handling of keyboard interrupt."""
-        with patch('src.main.MatlabAgent') as mock_matlab_agent, \
-                patch('src.main.setup_logger') as mock_setup_logger, \
-                patch('src.main.load_config') as mock_load_config, \
+        with patch('src.core.agent.MatlabAgent') as mock_matlab_agent, \
+                patch('src.utils.logger.setup_logger') as mock_setup_logger, \
+                patch('src.utils.config_loader.load_config') as mock_load_config, \
                 patch('pathlib.Path.exists', return_value=True):
 
             mock_logger = MagicMock()
@@ -163,7 +183,7 @@ class TestMainFunction:
             mock_agent.start.side_effect = KeyboardInterrupt()
             mock_matlab_agent.return_value = mock_agent
 
-            result = cli_runner.invoke(main, [])
+            result = run_cli([])
 
             mock_agent.stop.assert_called_once()
             mock_logger.info.assert_called_with(
@@ -171,11 +191,11 @@ class TestMainFunction:
             )
             assert result.exit_code == 0
 
-    def test_main_general_exception(self, cli_runner, default_config):
+    def test_main_general_exception(self, run_cli, default_config):
         """Test handling of general exceptions during agent startup."""
-        with patch('src.main.MatlabAgent') as mock_matlab_agent, \
-                patch('src.main.setup_logger') as mock_setup_logger, \
-                patch('src.main.load_config') as mock_load_config, \
+        with patch('src.core.agent.MatlabAgent') as mock_matlab_agent, \
+                patch('src.utils.logger.setup_logger') as mock_setup_logger, \
+                patch('src.utils.config_loader.load_config') as mock_load_config, \
                 patch('pathlib.Path.exists', return_value=True):
 
             mock_logger = MagicMock()
@@ -187,18 +207,18 @@ class TestMainFunction:
             mock_agent.start.side_effect = test_exception
             mock_matlab_agent.return_value = mock_agent
 
-            result = cli_runner.invoke(main, [])
+            result = run_cli([])
 
             mock_agent.stop.assert_called_once()
             mock_logger.error.assert_called_with(
                 "Error running agent: %s", test_exception)
             assert result.exit_code == 0
 
-    def test_invalid_log_level_fallback(self, cli_runner, invalid_log_config):
+    def test_invalid_log_level_fallback(self, run_cli, invalid_log_config):
         """Test fallback to INFO level when invalid log level is provided."""
-        with patch('src.main.MatlabAgent') as mock_matlab_agent, \
-                patch('src.main.setup_logger') as mock_setup_logger, \
-                patch('src.main.load_config') as mock_load_config, \
+        with patch('src.core.agent.MatlabAgent') as mock_matlab_agent, \
+                patch('src.utils.logger.setup_logger') as mock_setup_logger, \
+                patch('src.utils.config_loader.load_config') as mock_load_config, \
                 patch('pathlib.Path.exists', return_value=True):
 
             mock_logger = MagicMock()
@@ -208,7 +228,7 @@ class TestMainFunction:
             mock_agent = MagicMock()
             mock_matlab_agent.return_value = mock_agent
 
-            result = cli_runner.invoke(main, [])
+            result = run_cli([])
 
             # Should fallback to INFO level for invalid log level
             mock_setup_logger.assert_called_once_with(
@@ -247,66 +267,34 @@ class TestMainFunction:
     # Test generate_default_config function
     def test_generate_default_config_success_importlib(self):
         """Test successful config generation using importlib.resources."""
-        config_content = b"test config content"
-        # Use relative path for cross-platform compatibility
-        test_dir = Path('test/dir')
-        config_path = test_dir / 'config.yaml'
+        config_path = Path('config.yaml')
 
-        with patch('pathlib.Path.cwd', return_value=test_dir), \
-                patch('pathlib.Path.exists', return_value=False), \
+        with patch('pathlib.Path.exists', return_value=False), \
                 patch('importlib.resources.files') as mock_files, \
-                patch('builtins.open', mock_open()) as mock_file:
+                patch('importlib.resources.as_file') as mock_as_file, \
+                patch('shutil.copyfile') as mock_copy:
 
             # Mock importlib.resources.files behavior
             mock_resource = MagicMock()
             mock_resource.joinpath.return_value = mock_resource
             mock_files.return_value = mock_resource
-
-            # Mock context manager for reading
-            mock_context = MagicMock()
-            mock_context.__enter__ = MagicMock(return_value=mock_context)
-            mock_context.__exit__ = MagicMock(return_value=None)
-            mock_context.read = MagicMock(return_value=config_content)
-            mock_resource.open = MagicMock(return_value=mock_context)
+            template_path = Path('package/config.yaml.template')
+            mock_as_file.return_value.__enter__.return_value = template_path
 
             with patch('builtins.print') as mock_print:
                 generate_default_config()
 
+                mock_as_file.assert_called_once_with(mock_resource)
+                mock_copy.assert_called_once_with(template_path, config_path)
                 # Check if print was called with the success message
                 expected_message = f"Configuration template copied to: {config_path}"
                 mock_print.assert_any_call(expected_message)
 
-    def test_generate_default_config_fallback_pkg_resources(self):
-        """Test config generation fallback to pkg_resources."""
-        config_content = b"test config content"
-        # Use relative path for cross-platform compatibility
-        test_dir = Path('test/dir')
-        config_path = test_dir / 'config.yaml'
-
-        # Create a mock pkg_resources module
-        mock_pkg_resources = MagicMock()
-        mock_pkg_resources.resource_string.return_value = config_content
-
-        with patch('pathlib.Path.cwd', return_value=test_dir), \
-                patch('pathlib.Path.exists', return_value=False), \
-                patch('importlib.resources.files', side_effect=ImportError()), \
-                patch.dict('sys.modules', {'pkg_resources': mock_pkg_resources}), \
-                patch('builtins.open', mock_open()) as mock_file, \
-                patch('builtins.print') as mock_print:
-
-            generate_default_config()
-
-            expected_message = f"Configuration template copied to: {config_path}"
-            mock_print.assert_any_call(expected_message)
-
     def test_generate_default_config_file_exists(self):
         """Test config generation when file already exists."""
-        test_dir = Path(
-            'test/dir')  # Use relative path for cross-platform compatibility
-        config_path = test_dir / 'config.yaml'
+        config_path = Path('config.yaml')
 
-        with patch('pathlib.Path.cwd', return_value=test_dir), \
-                patch('pathlib.Path.exists', return_value=True), \
+        with patch('pathlib.Path.exists', return_value=True), \
                 patch('builtins.print') as mock_print:
 
             generate_default_config()
@@ -316,11 +304,7 @@ class TestMainFunction:
 
     def test_generate_default_config_file_not_found(self):
         """Test config generation when template file is not found."""
-        test_dir = Path(
-            'test/dir')  # Use relative path for cross-platform compatibility
-
-        with patch('pathlib.Path.cwd', return_value=test_dir), \
-                patch('pathlib.Path.exists', return_value=False), \
+        with patch('pathlib.Path.exists', return_value=False), \
                 patch('importlib.resources.files') as mock_files, \
                 patch('builtins.print') as mock_print:
 
@@ -334,11 +318,7 @@ class TestMainFunction:
     def test_generate_default_config_general_exception(self):
         """Test config generation with general exception."""
         test_error = Exception("General error")
-        # Use relative path for cross-platform compatibility
-        test_dir = Path('test/dir')
-
-        with patch('pathlib.Path.cwd', return_value=test_dir), \
-                patch('pathlib.Path.exists', return_value=False), \
+        with patch('pathlib.Path.exists', return_value=False), \
                 patch('importlib.resources.files', side_effect=test_error), \
                 patch('builtins.print') as mock_print:
 
@@ -347,35 +327,12 @@ class TestMainFunction:
             expected_message = f"Error generating configuration file: {test_error}"
             mock_print.assert_any_call(expected_message)
 
-    def test_generate_config_with_attribute_error_fallback(self):
-        """Test config generation with AttributeError fallback to pkg_resources."""
-        config_content = b"test config content"
-        # Use relative path for cross-platform compatibility
-        test_dir = Path('test/dir')
-        config_path = test_dir / 'config.yaml'
-
-        # Create a mock pkg_resources module
-        mock_pkg_resources = MagicMock()
-        mock_pkg_resources.resource_string.return_value = config_content
-
-        with patch('pathlib.Path.cwd', return_value=test_dir), \
-                patch('pathlib.Path.exists', return_value=False), \
-                patch('importlib.resources.files', side_effect=AttributeError()), \
-                patch.dict('sys.modules', {'pkg_resources': mock_pkg_resources}), \
-                patch('builtins.open', mock_open()) as mock_file, \
-                patch('builtins.print') as mock_print:
-
-            generate_default_config()
-
-            expected_message = f"Configuration template copied to: {config_path}"
-            mock_print.assert_any_call(expected_message)
-
-    # Test generate_default_project function
     def test_generate_default_project_success_importlib(self):
         """Test successful project generation using importlib.resources."""
         with patch('pathlib.Path.exists', return_value=False), \
                 patch('importlib.resources.files') as mock_files, \
-                patch('builtins.open', mock_open()) as mock_file, \
+                patch('importlib.resources.as_file'), \
+                patch('shutil.copyfile') as mock_copy, \
                 patch('builtins.print') as mock_print:
 
             # Mock importlib.resources.files behavior
@@ -383,38 +340,15 @@ class TestMainFunction:
             mock_resource.joinpath.return_value = mock_resource
             mock_files.return_value = mock_resource
 
-            # Mock context manager for reading
-            mock_context = MagicMock()
-            mock_context.__enter__ = MagicMock(return_value=mock_context)
-            mock_context.__exit__ = MagicMock(return_value=None)
-            mock_context.read = MagicMock(return_value=b"content")
-            mock_resource.open = MagicMock(return_value=mock_context)
-
             generate_default_project()
 
+            assert mock_copy.call_count == 8
+
             # Verify summary is printed - look for any call containing "Files
             # created"
             print_calls = [str(call) for call in mock_print.call_args_list]
             assert any("🆕 Files created:" in call for call in print_calls)
 
-    def test_generate_default_project_fallback_pkg_resources(self):
-        """Test project generation fallback to pkg_resources."""
-        # Create a mock pkg_resources module
-        mock_pkg_resources = MagicMock()
-        mock_pkg_resources.resource_string.return_value = b"content"
-
-        with patch('pathlib.Path.exists', return_value=False), \
-                patch('importlib.resources.files', side_effect=ImportError()), \
-                patch.dict('sys.modules', {'pkg_resources': mock_pkg_resources}), \
-                patch('builtins.open', mock_open()), \
-                patch('builtins.print') as mock_print:
-
-            generate_default_project()
-
-            # Verify summary is printed
-            print_calls = [str(call) for call in mock_print.call_args_list]
-            assert any("🆕 Files created:" in call for call in print_calls)
-
     def test_generate_default_project_all_files_exist(self):
         """Test project generation when all files already exist."""
         with patch('pathlib.Path.exists', return_value=True), \
@@ -453,7 +387,7 @@ class TestMainFunction:
             mock_print.assert_any_call(expected_message)
 
     # Test logging level parsing edge cases
-    def test_various_log_levels(self, cli_runner):
+    def test_various_log_levels(self, run_cli):
         """Test different logging levels are handled correctly."""
         log_levels = ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']
 
@@ -463,9 +397,9 @@ class TestMainFunction:
                 'agent': {'agent_id': 'test_agent'}
             }
 
-            with patch('src.main.MatlabAgent') as mock_matlab_agent, \
-                    patch('src.main.setup_logger') as mock_setup_logger, \
-                    patch('src.main.load_config', return_value=config), \
+            with patch('src.core.agent.MatlabAgent') as mock_matlab_agent, \
+                    patch('src.utils.logger.setup_logger') as mock_setup_logger, \
+                    patch('src.utils.config_loader.load_config', return_value=config), \
                     patch('pathlib.Path.exists', return_value=True):
 
                 mock_logger = MagicMock()
@@ -473,7 +407,7 @@ class TestMainFunction:
                 mock_agent = MagicMock()
                 mock_matlab_agent.return_value = mock_agent
 
-                result = cli_runner.invoke(main, [])
+                result = run_cli([])
 
                 expected_level = getattr(logging, level)
                 mock_setup_logger.assert_called_once_with(
@@ -492,13 +426,13 @@ class TestMainFunction:
             mock_main_func.assert_called_once()
 
     # Test edge cases for CLI options
-    def test_cli_help_option(self, cli_runner):
+    def test_cli_help_option(self, run_cli):
         """Test that help option works correctly."""
-        result = cli_runner.invoke(main, ['--help'])
+        result = run_cli(['--help'])
         assert "An agent service to manage Matlab simulations." in result.output
         assert result.exit_code == 0
 
-    def test_cli_short_config_option(self, cli_runner, mock_dependencies):
+    def test_cli_short_config_option(self, run_cli, mock_dependencies):
         """Test short form of config option (-c)."""
         mock_matlab_agent, mock_setup_logger, mock_load_config, mock_logger = mock_dependencies
 
@@ -508,24 +442,23 @@ class TestMainFunction:
         }
 
         config_path = Path('matlab_agent/config/config.yaml.template').resolve()
-        result = cli_runner.invoke(main, ['-c', str(config_path)])
+        result = run_cli(['-c', str(config_path)])
 
         mock_load_config.assert_called_once_with(str(config_path))
         assert result.exit_code == 0
 
-    def test_multiple_flags_priority(self, cli_runner):
+    def test_multiple_flags_priority(self, run_cli):
         """Test that generate flags take priority over other operations."""
         with patch('src.main.generate_default_config') as mock_gen_conf, \
                 patch('src.main.generate_default_project') as mock_gen_proj:
 
             # Test generate-config takes precedence
-            result = cli_runner.invoke(
-                main, ['--generate-config', '--generate-project'])
+            result = run_cli(['--generate-config', '--generate-project'])
             mock_gen_conf.assert_called_once()
             mock_gen_proj.assert_not_called()
             assert result.exit_code == 0
 
-    def test_broker_type_hardcoded(self, cli_runner, mock_dependencies):
+    def test_broker_type_hardcoded(self, run_cli, mock_dependencies):
         """Test that broker_type is hardcoded to 'rabbitmq'."""
         mock_matlab_agent, mock_setup_logger, mock_load_config, mock_logger = mock_dependencies
 
@@ -535,7 +468,7 @@ class TestMainFunction:
         }
 
         with patch('pathlib.Path.exists', return_value=True):
-            result = cli_runner.invoke(main, [])
+            result = run_cli([])
 
             mock_matlab_agent.assert_called_once_with(
                 'test_agent',
@@ -544,28 +477,19 @@ class TestMainFunction:
             )
             assert result.exit_code == 0
 
-    def test_generate_project_with_attribute_error_fallback(self):
-        """Test project generation with AttributeError fallback to pkg_resources."""
-        # Create a mock pkg_resources module
-        mock_pkg_resources = MagicMock()
-        mock_pkg_resources.resource_string.return_value = b"content"
-
-        with patch('pathlib.Path.exists', return_value=False), \
-                patch('importlib.resources.files', side_effect=AttributeError()), \
-                patch.dict('sys.modules', {'pkg_resources': mock_pkg_resources}), \
-                patch('builtins.open', mock_open()), \
-                patch('builtins.print') as mock_print:
-
-            generate_default_project()
-
-            # Verify summary is printed
-            print_calls = [str(call) for call in mock_print.call_args_list]
-            assert any("🆕 Files created:" in call for call in print_calls)
-
-    def test_config_file_nonexistent_path(self, cli_runner):
+    def test_config_file_nonexistent_path(self, run_cli):
         """Test main function with nonexistent config file path."""
-        with patch('src.main.load_config', side_effect=FileNotFoundError("Config not found")):
-            result = cli_runner.invoke(
-                main, ['-c', str(Path('/nonexistent/config.yaml'))])
+        with patch('src.utils.config_loader.load_config', side_effect=FileNotFoundError("Config not found")):
+            result = run_cli(['-c', str(Path('/nonexistent/config.yaml'))])
             # Should exit with error code due to unhandled exception
             assert result.exit_code != 0
+
+    def test_import_does_not_load_agent(self):
+        """Importing the CLI must not pull in the agent, broker or logging."""
+        code = ("import sys, src.main; "
+                "print('src.core.agent' in sys.modules, 'pika' in sys.modules, "
+                "'logging' in sys.modules)")
+        result = subprocess.run([sys.executable, '-c', code],
+                                capture_output=True, text=True, check=True,
+                                cwd=Path(__file__).resolve().parents[2])
+        assert result.stdout.split() == ['False', 'False', 'False']
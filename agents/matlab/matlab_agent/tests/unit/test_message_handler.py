@@ -12,7 +12,8 @@ from src.comm.rabbitmq.message_handler import (
     SimulationInputs,
     SimulationOutputs,
     SimulationData,
-    MessagePayload
+    MessagePayload,
+    _SafeLoader
 )
 
 
@@ -126,6 +127,7 @@ class TestMessageHandler:
 
         self.mock_properties = Mock(spec=BasicProperties)
         self.mock_properties.message_id = "test_message_id"
+        self.mock_properties.reply_to = None
 
     def test_init_sets_attributes_correctly(self):
         """Test that initialization sets all attributes correctly."""
@@ -139,7 +141,7 @@ class TestMessageHandler:
         """Test that get_agent_id returns the correct agent ID."""
         assert self.handler.get_agent_id() == self.agent_id
 
-    @patch('src.comm.rabbitmq.message_handler.yaml.safe_load')
+    @patch('src.comm.rabbitmq.message_handler.yaml.load')
     @patch('src.comm.rabbitmq.message_handler.handle_batch_simulation')
     @patch('src.comm.rabbitmq.message_handler.create_response')
     def test_handle_message_batch_simulation_success(
@@ -169,7 +171,8 @@ class TestMessageHandler:
         )
 
         # Verify
-        mock_yaml_load.assert_called_once_with(b'test message body')
+        mock_yaml_load.assert_called_once_with(
+            b'test message body', Loader=_SafeLoader)
         mock_handle_batch.assert_called_once_with(
             message_data,
             'source',
@@ -181,7 +184,7 @@ class TestMessageHandler:
             delivery_tag="test_tag"
         )
 
-    @patch('src.comm.rabbitmq.message_handler.yaml.safe_load')
+    @patch('src.comm.rabbitmq.message_handler.yaml.load')
     @patch('src.comm.rabbitmq.message_handler.handle_streaming_simulation')
     @patch('src.comm.rabbitmq.message_handler.create_response')
     def test_handle_message_streaming_simulation_success(
@@ -211,7 +214,8 @@ class TestMessageHandler:
         )
 
         # Verify
-        mock_yaml_load.assert_called_once_with(b'test message body')
+        mock_yaml_load.assert_called_once_with(
+            b'test message body', Loader=_SafeLoader)
         mock_handle_streaming.assert_called_once_with(
             message_data,
             'source',
@@ -224,7 +228,7 @@ class TestMessageHandler:
             delivery_tag="test_tag"
         )
 
-    @patch('src.comm.rabbitmq.message_handler.yaml.safe_load')
+    @patch('src.comm.rabbitmq.message_handler.yaml.load')
     @patch('src.comm.rabbitmq.message_handler.create_response')
     def test_handle_message_yaml_parsing_error(
         self, mock_create_response, mock_yaml_load
@@ -266,7 +270,7 @@ class TestMessageHandler:
             delivery_tag="test_tag", requeue=False
         )
 
-    @patch('src.comm.rabbitmq.message_handler.yaml.safe_load')
+    @patch('src.comm.rabbitmq.message_handler.yaml.load')
     @patch('src.comm.rabbitmq.message_handler.create_response')
     def test_handle_message_validation_error(
         self, mock_create_response, mock_yaml_load
@@ -303,7 +307,7 @@ class TestMessageHandler:
             delivery_tag="test_tag", requeue=False
         )
 
-    @patch('src.comm.rabbitmq.message_handler.yaml.safe_load')
+    @patch('src.comm.rabbitmq.message_handler.yaml.load')
     @patch('src.comm.rabbitmq.message_handler.create_response')
     def test_handle_message_unknown_simulation_type(
         self, mock_create_response, mock_yaml_load
@@ -360,7 +364,7 @@ class TestMessageHandler:
             # Verify the mock was called
             mock_handle.assert_called_once()
 
-    @patch('src.comm.rabbitmq.message_handler.yaml.safe_load')
+    @patch('src.comm.rabbitmq.message_handler.yaml.load')
     @patch('src.comm.rabbitmq.message_handler.create_response')
     def test_handle_message_general_exception(
         self, mock_create_response, mock_yaml_load
@@ -402,7 +406,7 @@ class TestMessageHandler:
             delivery_tag="test_tag", requeue=False
         )
 
-    @patch('src.comm.rabbitmq.message_handler.yaml.safe_load')
+    @patch('src.comm.rabbitmq.message_handler.yaml.load')
     @patch('src.comm.rabbitmq.message_handler.create_response')
     def test_handle_message_send_error_response_fails(
         self, mock_create_response, mock_yaml_load
@@ -434,7 +438,7 @@ class TestMessageHandler:
         # Setup properties without message_id
         self.mock_properties.message_id = None
 
-        with patch('src.comm.rabbitmq.message_handler.yaml.safe_load') as mock_yaml_load:
+        with patch('src.comm.rabbitmq.message_handler.yaml.load') as mock_yaml_load:
             mock_yaml_load.side_effect = Exception("Test error")
 
             with patch('src.comm.rabbitmq.message_handler.create_response') as mock_create_response:
@@ -463,7 +467,7 @@ class TestMessageHandler:
         assert handler.path_simulation is None
         assert handler.response_templates == {}
 
-    @patch('src.comm.rabbitmq.message_handler.yaml.safe_load')
+    @patch('src.comm.rabbitmq.message_handler.yaml.load')
     def test_routing_key_extraction(self, mock_yaml_load):
         """Test that routing key is correctly extracted for source."""
         # Setup mock for successful processing
@@ -563,6 +567,7 @@ class TestMessageHandlerIntegration:
 
         mock_properties = Mock(spec=BasicProperties)
         mock_properties.message_id = "integration_message_id"
+        mock_properties.reply_to = None
 
         # Execute
         self.handler.handle_message(
@@ -621,6 +626,7 @@ class TestMessageHandlerIntegration:
 
         mock_properties = Mock(spec=BasicProperties)
         mock_properties.message_id = "streaming_message_id"
+        mock_properties.reply_to = None
 
         # Execute
         self.handler.handle_message(
@@ -0,0 +1,166 @@
+"""Unit tests for the performance monitor."""
+
+import csv
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.utils.performance_monitor import PerformanceMonitor
+
+
+@pytest.fixture(autouse=True)
+def fresh_singleton(monkeypatch):
+    """Give each test its own PerformanceMonitor singleton."""
+    monkeypatch.setattr(PerformanceMonitor, '_instance', None)
+    monkeypatch.setattr(PerformanceMonitor, '_initialized', False)
+
+
+@pytest.fixture
+def perf_config(tmp_path):
+    """Return a configuration enabling monitoring into tmp_path."""
+    return {
+        'performance': {
+            'enabled': True,
+            'log_dir': str(tmp_path),
+            'log_filename': 'metrics.csv'
+        }
+    }
+
+
+@pytest.fixture
+def monitor(perf_config):
+    """Provide an enabled monitor, closed after the test."""
+    instance = PerformanceMonitor(perf_config)
+    yield instance
+    instance.close()
+
+
+def _fake_clock(monkeypatch, readings):
+    """Make the monitor read successive values from its monotonic clock."""
+    pending = iter(readings)
+    monkeypatch.setattr(
+        'src.utils.performance_monitor.time',
+        SimpleNamespace(time=time.time, monotonic=lambda: next(pending)))
+
+
+def _run_operation(monitor, operation_id):
+    """Record a full operation, reading the clock five times."""
+    monitor.start_operation(operation_id)
+    monitor.record_matlab_start()
+    monitor.record_matlab_startup_complete()
+    monitor.record_simulation_complete()
+    monitor.record_matlab_stop()
+    monitor.record_result_sent()
+    monitor.complete_operation()
+
+
+def _read_rows(path):
+    """Return all rows of a metrics CSV file."""
+    with open(path, newline='', encoding='utf-8') as f:
+        return list(csv.reader(f))
+
+
+def test_monitor_is_a_singleton(perf_config):
+    """Test later constructions return the first, configured instance."""
+    first = PerformanceMonitor(perf_config)
+    try:
+        assert PerformanceMonitor() is first
+        assert first.enabled
+    finally:
+        first.close()
+
+
+def test_disabled_without_config():
+    """Test monitoring is off and records nothing without configuration."""
+    monitor = PerformanceMonitor()
+    _run_operation(monitor, 'op')
+    assert not monitor.enabled
+    assert monitor.csv_path is None
+    assert monitor.get_summary() == {}
+
+
+def test_csv_header_written_once(monitor, perf_config):
+    """
+    Test the header is written when the file is created and rows are
+    appended across operations and monitor instances.
+    """
+    _run_operation(monitor, 'op-1')
+    _run_operation(monitor, 'op-2')
+    csv_path = monitor.csv_path
+    monitor.close()
+
+    PerformanceMonitor._instance = None
+    second = PerformanceMonitor(perf_config)
+    try:
+        _run_operation(second, 'op-3')
+    finally:
+        second.close()
+
+    rows = _read_rows(csv_path)
+    assert rows[0][0] == 'Operation ID'
+    assert [row[0] for row in rows[1:]] == ['op-1', 'op-2', 'op-3']
+    assert all(len(row) == len(rows[0]) for row in rows)
+
+
+def test_rows_are_flushed_per_operation(monitor):
+    """Test each completed operation is on disk while the file stays open."""
+    _run_operation(monitor, 'op-1')
+    assert not monitor._csv_file.closed
+    assert [row[0] for row in _read_rows(monitor.csv_path)[1:]] == ['op-1']
+
+
+def test_close_disables_monitoring(monitor):
+    """Test close() closes the CSV file and stops recording."""
+    csv_file = monitor._csv_file
+    monitor.close()
+
+    assert csv_file.closed
+    assert not monitor.enabled
+    _run_operation(monitor, 'after-close')
+    assert len(_read_rows(monitor.csv_path)) == 1
+    # Closing twice, e.g. again at exit, is harmless
+    monitor.close()
+
+
+def test_get_summary(monitor, monkeypatch):
+    """Test the summary statistics of the recorded stage durations."""
+    assert monitor.get_summary() == {}
+    # Request, MATLAB start, startup done, simulation done, completed
+    _fake_clock(monkeypatch, [0.0, 1.0, 3.0, 7.0, 8.0,
+                              10.0, 10.0, 11.0, 12.0, 14.0])
+    _run_operation(monitor, 'op-1')
+    _run_operation(monitor, 'op-2')
+
+    assert monitor.get_summary() == {
+        'avg_startup_time': 1.5,
+        'min_startup_time': 1.0,
+        'max_startup_time': 2.0,
+        'avg_simulation_time': 2.5,
+        'min_simulation_time': 1.0,
+        'max_simulation_time': 4.0,
+        'avg_total_time': 6.0,
+        'min_total_time': 4.0,
+        'max_total_time': 8.0,
+        'total_operations': 2,
+    }
+
+
+def test_metrics_history_is_bounded(perf_config, monkeypatch):
+    """
+    Test the in-memory history keeps the latest operations only while the
+    summary still counts all of them.
+    """
+    monkeypatch.setattr(
+        'src.utils.performance_monitor.METRICS_HISTORY_LIMIT', 3)
+    monitor = PerformanceMonitor(perf_config)
+    try:
+        for index in range(5):
+            _run_operation(monitor, f'op-{index}')
+
+        assert [m.operation_id for m in monitor.metrics_history] == [
+            'op-2', 'op-3', 'op-4']
+        assert monitor.get_summary()['total_operations'] == 5
+        assert len(_read_rows(monitor.csv_path)) == 6
+    finally:
+        monitor.close()
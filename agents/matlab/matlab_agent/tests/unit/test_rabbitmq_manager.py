@@ -1,4 +1,7 @@
+import json
+
 import pytest
+import yaml
 from pika import exceptions as pika_exceptions
 from unittest import mock
 from unittest.mock import MagicMock
@@ -87,6 +90,35 @@ class TestRabbitMQManager:
             prefetch_count=mock_config["queue"]["prefetch_count"],
         )
 
+    def test_reconnect_reapplies_qos(self, mock_connection, mock_config,
+                                     agent_id):
+        _, channel_mock = mock_connection
+        mock_config["queue"]["prefetch_count"] = 4
+        manager = RabbitMQManager(agent_id, mock_config)
+
+        manager.connect()
+        manager.connect()
+
+        assert channel_mock.basic_qos.call_count == 2
+        channel_mock.basic_qos.assert_called_with(prefetch_count=4)
+
+    def test_reconnect_reuses_open_connection(self, mock_connection,
+                                              mock_config, agent_id):
+        connection_mock, channel_mock = mock_connection
+        manager = RabbitMQManager(agent_id, mock_config)
+
+        manager.connect()
+        manager.connect()
+        assert connection_mock.call_count == 1
+        assert connection_mock.return_value.channel.call_count == 2
+
+        # A closed connection is replaced
+        manager.connection.is_open = False
+        connection_mock.return_value = MagicMock()
+        connection_mock.return_value.channel.return_value = channel_mock
+        manager.connect()
+        assert connection_mock.call_count == 2
+
     def test_register_message_handler(self, rabbitmq_manager):
         def handler(channel, method, properties, body):
             pass
@@ -164,6 +196,47 @@ class TestRabbitMQManager:
         failed = rabbitmq_manager.send_result("dest", payload)
         assert failed is False
 
+    def test_send_raw_result_splices_routing_fields(
+            self, rabbitmq_manager, mock_connection, agent_id):
+        _, channel_mock = mock_connection
+
+        assert rabbitmq_manager.send_raw_result("dt", b'{"data": [1, 2]}\n')
+
+        kwargs = channel_mock.basic_publish.call_args.kwargs
+        assert kwargs["routing_key"] == f"{agent_id}.result.dt"
+        assert kwargs["properties"].content_type == "application/json"
+        assert json.loads(kwargs["body"]) == {
+            "data": [1, 2], "source": agent_id, "destinations": ["dt"]}
+
+    def test_send_results_publishes_one_message(
+            self, rabbitmq_manager, mock_connection, agent_id):
+        _, channel_mock = mock_connection
+
+        assert rabbitmq_manager.send_results("dt", [{"n": 1}, {"n": 2}])
+
+        channel_mock.basic_publish.assert_called_once()
+        kwargs = channel_mock.basic_publish.call_args.kwargs
+        assert kwargs["routing_key"] == f"{agent_id}.result.dt"
+        assert yaml.safe_load(kwargs["body"]) == {
+            "results": [{"n": 1}, {"n": 2}],
+            "source": agent_id, "destinations": ["dt"]}
+
+    def test_send_result_honours_reply_to(
+            self, rabbitmq_manager, mock_connection, agent_id):
+        _, channel_mock = mock_connection
+        reply_to = "amq.rabbitmq.reply-to.g1h2AA"
+
+        rabbitmq_manager.set_reply_to("dt", reply_to)
+        assert rabbitmq_manager.send_result("dt", {"status": "ok"})
+        kwargs = channel_mock.basic_publish.call_args.kwargs
+        assert kwargs["exchange"] == ""
+        assert kwargs["routing_key"] == reply_to
+
+        rabbitmq_manager.set_reply_to("dt", None)
+        assert rabbitmq_manager.send_result("dt", {"status": "ok"})
+        kwargs = channel_mock.basic_publish.call_args.kwargs
+        assert kwargs["routing_key"] == f"{agent_id}.result.dt"
+
     def test_close_methods(self, rabbitmq_manager, mock_connection):
         _, channel_mock = mock_connection
 
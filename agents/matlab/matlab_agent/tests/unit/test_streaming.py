@@ -1,22 +1,51 @@
 """Test suite for streaming functionality."""
 
+import importlib.util
+import io
+import json
 import socket
+import sys
 import time
 from pathlib import Path
 from unittest.mock import MagicMock, Mock, patch
 import subprocess
 
+import psutil
 import pytest
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
 from src.core.streaming import (
+    F_SETPIPE_SZ,
+    PIPE_BUFFER_SIZE,
     MatlabStreamingController,
     MatlabStreamingError,
     StreamingConnection,
     _handle_streaming_error,
+    _matlab_executable,
+    _resolved_sim_dir,
+    close_listeners,
     handle_streaming_simulation)
 from src.utils.performance_monitor import PerformanceMonitor
 
 
+def _recv_into_from(chunks):
+    """Build a recv_into side effect that copies successive chunks."""
+    pending = list(chunks)
+
+    def recv_into(view):
+        data = pending.pop(0)
+        size = min(len(view), len(data))
+        view[:size] = data[:size]
+        if size < len(data):
+            pending.insert(0, data[size:])
+        return size
+    return recv_into
+
+
 @pytest.fixture
 def response_templates():
     """Fixture providing standardized response templates for tests."""
@@ -90,9 +119,11 @@ def streaming_connection():
     Returns:
         StreamingConnection: A connection instance
     """
-    connection = StreamingConnection('127.0.0.1', 0)
-    yield connection
-    connection.close()
+    with patch.dict('src.core.streaming._LISTENERS', clear=True):
+        connection = StreamingConnection('127.0.0.1', 0)
+        yield connection
+        connection.close()
+        close_listeners()
 
 
 @pytest.fixture
@@ -101,6 +132,22 @@ def performance_monitor():
     return PerformanceMonitor()
 
 
+@pytest.fixture
+def stdlib_json(monkeypatch):
+    """
+    Fixture making the streaming module use its standard library JSON
+    fallback, as when orjson is not installed.
+    """
+    spec = importlib.util.spec_from_file_location(
+        'src.core._streaming_stdlib', sys.modules['src.core.streaming'].__file__)
+    fallback = importlib.util.module_from_spec(spec)
+    with patch.dict(sys.modules, {'orjson': None}):
+        spec.loader.exec_module(fallback)
+    for name in ('_json_loads', '_json_dumps', '_json_line'):
+        monkeypatch.setattr(
+            f'src.core.streaming.{name}', getattr(fallback, name))
+
+
 @pytest.fixture
 def matlab_controller(
         monkeypatch,
@@ -174,19 +221,197 @@ def test_streaming_connection_lifecycle(streaming_connection):
     streaming_connection.matlab_process = fake_proc
 
     # Close connection
-    streaming_connection.close()
+    with patch('src.core.streaming._child_processes', return_value=[]):
+        streaming_connection.close()
 
     # Verify process was terminated
     fake_proc.terminate.assert_called_once()
+    fake_proc.poll.return_value = 0
 
     # Clean up sockets
     client.close()
     server.close()
 
 
+def test_accept_connection_fails_when_matlab_exits(streaming_connection):
+    """
+    Test that accept_connection fails fast if MATLAB exits without connecting.
+    """
+    streaming_connection.start_server()
+    streaming_connection.matlab_process = subprocess.Popen(
+        [sys.executable, '-c', 'pass'])
+
+    start = time.monotonic()
+    with pytest.raises(MatlabStreamingError, match='exited before connecting'):
+        streaming_connection.accept_connection(timeout=30)
+    assert time.monotonic() - start < 5
+
+
+def test_accept_connection_timeout(streaming_connection):
+    """
+    Test that accept_connection raises socket.timeout when nobody connects.
+    """
+    streaming_connection.start_server()
+    with pytest.raises(socket.timeout):
+        streaming_connection.accept_connection(timeout=0.1)
+
+
+@pytest.mark.skipif(F_SETPIPE_SZ is None, reason='requires F_SETPIPE_SZ')
+def test_start_output_readers_resizes_pipes(streaming_connection):
+    """
+    Test that the kernel buffers of MATLAB's output pipes are enlarged.
+    """
+    streaming_connection.matlab_process = subprocess.Popen(
+        [sys.executable, '-c', 'pass'],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+    streaming_connection.start_output_readers()
+
+    for stream in (streaming_connection.matlab_process.stdout,
+                   streaming_connection.matlab_process.stderr):
+        assert fcntl.fcntl(stream.fileno(), fcntl.F_GETPIPE_SZ) == \
+            PIPE_BUFFER_SIZE
+    streaming_connection.matlab_process.wait()
+    for reader in streaming_connection.output_readers:
+        reader.join()
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason='requires a POSIX shell')
+def test_streaming_connection_close_stops_child_processes(streaming_connection):
+    """
+    Test that close() also stops processes started by the MATLAB launcher.
+    """
+    launcher = subprocess.Popen(['sh', '-c', 'sleep 60 & wait'])
+    deadline = time.monotonic() + 5
+    while not psutil.Process(launcher.pid).children():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    child = psutil.Process(launcher.pid).children()[0]
+    streaming_connection.matlab_process = launcher
+
+    streaming_connection.close()
+
+    assert launcher.poll() is not None
+    assert not child.is_running()
+
+
+def test_streaming_connection_reuses_listener():
+    """
+    Test that connections share one listening socket that outlives close().
+    """
+    with patch.dict('src.core.streaming._LISTENERS', clear=True):
+        first = StreamingConnection('127.0.0.1', 0)
+        second = StreamingConnection('127.0.0.1', 0)
+        first.start_server()
+        listener = first.socket
+        first.close()
+
+        second.start_server()
+        assert second.socket is listener
+        assert listener.fileno() != -1
+        second.close()
+        close_listeners()
+        assert listener.fileno() == -1
+
+
+def test_streaming_connection_drops_stale_connections():
+    """
+    Test that connections queued before a simulation starts are dropped.
+    """
+    with patch.dict('src.core.streaming._LISTENERS', clear=True):
+        first = StreamingConnection('127.0.0.1', 0)
+        first.start_server()
+        stale = socket.create_connection(first.socket.getsockname())
+        stale.settimeout(1)
+
+        second = StreamingConnection('127.0.0.1', 0)
+        second.start_server()
+        assert stale.recv(1) == b''
+        with pytest.raises(socket.timeout):
+            second.accept_connection(timeout=0.1)
+
+        stale.close()
+        close_listeners()
+        assert first.socket.fileno() == -1
+
+
+def test_streaming_connection_sets_receive_buffer():
+    """
+    Test that the listener is created with the configured receive buffer.
+    """
+    connection = StreamingConnection('127.0.0.1', 0, recv_buffer_size=1 << 18)
+    with patch.dict('src.core.streaming._LISTENERS', clear=True):
+        connection.start_server()
+        # Linux reports twice the requested size for bookkeeping overhead
+        assert connection.socket.getsockopt(
+            socket.SOL_SOCKET, socket.SO_RCVBUF) >= 1 << 18
+        connection.socket.close()
+
+
+def test_streaming_connection_drains_output(streaming_connection):
+    """
+    Test that MATLAB stdout/stderr are drained to the logger until EOF.
+    """
+    fake_proc = MagicMock()
+    fake_proc.poll.return_value = 0
+    fake_proc.stdout = io.BytesIO(b'line one\nline two\n')
+    fake_proc.stderr = io.BytesIO(b'warning\n')
+    streaming_connection.matlab_process = fake_proc
+
+    with patch('src.core.streaming.logger') as mock_logger:
+        streaming_connection.start_output_readers()
+        streaming_connection.close()
+
+    assert not streaming_connection.output_readers
+    assert mock_logger.info.call_count == 2
+    mock_logger.warning.assert_called_once_with("MATLAB: %s", 'warning')
+    assert fake_proc.stdout.closed and fake_proc.stderr.closed
+
+
+def test_controller_validates_path_and_file(
+        tmp_path, mock_rabbit_client, response_templates, tcp_settings):
+    """
+    Test the controller rejects a missing directory or simulation file.
+    """
+    (tmp_path / 'sim.m').write_text('disp(1)')
+    args = (mock_rabbit_client, response_templates, tcp_settings)
+
+    controller = MatlabStreamingController(
+        str(tmp_path), 'sim.m', 'src', *args)
+    assert controller.sim_path == tmp_path.resolve()
+
+    with pytest.raises(FileNotFoundError, match='not found in directory'):
+        MatlabStreamingController(str(tmp_path), 'missing.m', 'src', *args)
+    with pytest.raises(FileNotFoundError, match='Directory not found'):
+        MatlabStreamingController(
+            str(tmp_path / 'nope'), 'sim.m', 'src', *args)
+
+
+def test_controller_validation_is_cached(
+        tmp_path, mock_rabbit_client, response_templates, tcp_settings):
+    """
+    Test directory resolution is cached while the file is checked on every
+    request, so files added or removed later are noticed.
+    """
+    args = (mock_rabbit_client, response_templates, tcp_settings)
+    with pytest.raises(FileNotFoundError):
+        MatlabStreamingController(str(tmp_path), 'late.m', 'src', *args)
+    (tmp_path / 'late.m').write_text('disp(1)')
+    MatlabStreamingController(str(tmp_path), 'late.m', 'src', *args)
+
+    hits = _resolved_sim_dir.cache_info().hits
+    MatlabStreamingController(str(tmp_path), 'late.m', 'src', *args)
+    assert _resolved_sim_dir.cache_info().hits == hits + 1
+
+    (tmp_path / 'late.m').unlink()
+    with pytest.raises(FileNotFoundError, match='not found in directory'):
+        MatlabStreamingController(str(tmp_path), 'late.m', 'src', *args)
+
+
+@patch('src.core.streaming.StreamingConnection.start_server')
 @patch('src.core.streaming.subprocess.Popen')
 def test_controller_start_failure(
-        mock_popen, matlab_controller, performance_monitor):
+        mock_popen, mock_start_server, matlab_controller, performance_monitor):
     """
     Test that controller.start raises MatlabStreamingError when Popen fails.
     """
@@ -214,12 +439,15 @@ def test_controller_start_success(
     # Mock the MATLAB process
     fake_proc = MagicMock()
     fake_proc.pid = 12345  # Set a valid PID
+    fake_proc.stdout = io.BytesIO()
+    fake_proc.stderr = io.BytesIO()
     mock_popen.return_value = fake_proc
 
     # Mock psutil Process
     mock_process = MagicMock()
     mock_process.memory_info.return_value = MagicMock(rss=1024 * 1024)  # 1 MB
-    mock_process.cpu_percent.return_value = 5.0  # 5% CPU
+    mock_process.cpu_times.return_value = MagicMock(user=0.05, system=0.0)
+    mock_process.create_time.return_value = time.time() - 1.0  # 5% CPU
     mock_psutil_process.return_value = mock_process
 
     # Start the controller
@@ -240,6 +468,37 @@ def test_controller_start_success(
     assert 'bridge_meta' in success_data
 
 
+@patch('src.core.streaming.StreamingConnection.start_server')
+@patch('src.core.streaming.subprocess.Popen')
+def test_controller_start_uses_spawn_friendly_popen(
+        mock_popen,
+        mock_start_server,
+        matlab_controller,
+        performance_monitor,
+        monkeypatch):
+    """
+    Test MATLAB is launched by absolute path without close_fds so that
+    subprocess can use posix_spawn.
+    """
+    monkeypatch.setattr('src.core.streaming.shutil.which',
+                        lambda name: '/opt/matlab/bin/matlab')
+    monkeypatch.setattr(
+        'src.core.streaming.MatlabStreamingController._sample_resources',
+        lambda self: {})
+    _matlab_executable.cache_clear()
+    mock_popen.return_value.stdout = None
+    mock_popen.return_value.stderr = None
+
+    try:
+        matlab_controller.start(performance_monitor)
+    finally:
+        _matlab_executable.cache_clear()
+
+    args, kwargs = mock_popen.call_args
+    assert args[0][0] == '/opt/matlab/bin/matlab'
+    assert kwargs['close_fds'] is False
+
+
 @patch('src.core.streaming.StreamingConnection.accept_connection')
 def test_controller_run_success(
         mock_accept,
@@ -254,10 +513,10 @@ def test_controller_run_success(
     fake_sock = MagicMock()
 
     # Setup socket to return a valid JSON line and then EOF
-    fake_sock.recv.side_effect = [
+    fake_sock.recv_into.side_effect = _recv_into_from([
         b'{"progress": {"percentage": 10}, "data": {"x":1}}\n',
         b''
-    ]
+    ])
     conn.connection = fake_sock
 
     # Attach mock connection to controller
@@ -269,6 +528,350 @@ def test_controller_run_success(
     # Verify result was sent
     assert mock_rabbit_client.send_result.call_count >= 1
 
+
+@patch('src.core.streaming.StreamingConnection.accept_connection')
+def test_controller_run_skips_invalid_json(
+        mock_accept,
+        matlab_controller,
+        mock_rabbit_client,
+        performance_monitor):
+    """
+    Test controller.run sends the inputs as one JSON line and skips
+    lines that fail to parse.
+    """
+    conn = StreamingConnection('host', 0)
+    fake_sock = MagicMock()
+    fake_sock.recv_into.side_effect = _recv_into_from([
+        b'{"a": 1\n{"b": 2}\n',
+        b''
+    ])
+    conn.connection = fake_sock
+    matlab_controller.connection = conn
+
+    matlab_controller.run({'param': 'value'}, performance_monitor=performance_monitor)
+
+    sent = fake_sock.sendall.call_args[0][0]
+    assert sent.endswith(b'\n')
+    assert json.loads(sent) == {'param': 'value'}
+    mock_rabbit_client.send_result.assert_called_once()
+    assert mock_rabbit_client.send_result.call_args[0][1]['data'] == {'b': 2}
+
+
+@patch('src.core.streaming.StreamingConnection.accept_connection')
+def test_controller_run_sends_integer_keyed_inputs(
+        mock_accept,
+        matlab_controller,
+        performance_monitor):
+    """
+    Test inputs with non-string keys are encoded like the json module does.
+    """
+    conn = StreamingConnection('host', 0)
+    fake_sock = MagicMock()
+    fake_sock.recv_into.side_effect = _recv_into_from([b''])
+    conn.connection = fake_sock
+    matlab_controller.connection = conn
+
+    matlab_controller.run({'table': {1: 2.5}}, performance_monitor=performance_monitor)
+
+    sent = fake_sock.sendall.call_args[0][0]
+    assert json.loads(sent) == json.loads(json.dumps({'table': {1: 2.5}}))
+
+
+@patch('src.core.streaming.RECV_BUFFER_SIZE', 8)
+@patch('src.core.streaming.StreamingConnection.accept_connection')
+def test_controller_run_split_lines(
+        mock_accept,
+        matlab_controller,
+        mock_rabbit_client,
+        performance_monitor):
+    """
+    Test controller.run reassembles lines split across reads and
+    grows the receive buffer for lines longer than it.
+    """
+    conn = StreamingConnection('host', 0)
+    fake_sock = MagicMock()
+    fake_sock.recv_into.side_effect = _recv_into_from([
+        b'{"a": 1}\n{"b"',
+        b': 2}\n',
+        b'{"long_key_',
+        b'value": 3}\n\n',
+        b''
+    ])
+    conn.connection = fake_sock
+    matlab_controller.connection = conn
+
+    matlab_controller.run({}, performance_monitor=performance_monitor)
+
+    sent = [c[0][1] for c in mock_rabbit_client.send_result.call_args_list]
+    assert [m['data'] for m in sent] == [
+        {'a': 1}, {'b': 2}, {'long_key_value': 3}]
+    assert [m['sequence'] for m in sent] == [0, 1, 2]
+
+
+@patch('src.core.streaming.RECV_BUFFER_SIZE', 8)
+@patch('src.core.streaming.StreamingConnection.accept_connection')
+def test_controller_run_line_over_many_reads(
+        mock_accept,
+        matlab_controller,
+        mock_rabbit_client,
+        performance_monitor):
+    """
+    Test controller.run finds line ends when a line arrives over many reads,
+    including after the pending line has been compacted.
+    """
+    conn = StreamingConnection('host', 0)
+    fake_sock = MagicMock()
+    fake_sock.recv_into.side_effect = _recv_into_from(
+        [b'{"a": 1}\n{"v": ['] + [b'1, '] * 100 + [b'1]}\n{"b": 2}\n', b''])
+    conn.connection = fake_sock
+    matlab_controller.connection = conn
+
+    matlab_controller.run({}, performance_monitor=performance_monitor)
+
+    sent = [c[0][1] for c in mock_rabbit_client.send_result.call_args_list]
+    assert [m['data'] for m in sent] == [
+        {'a': 1}, {'v': [1] * 101}, {'b': 2}]
+
+
+@patch('src.core.streaming.StreamingConnection.accept_connection')
+def test_controller_run_passthrough(
+        mock_accept,
+        matlab_controller,
+        mock_rabbit_client,
+        performance_monitor):
+    """
+    Test plain JSON lines are forwarded raw while progress lines are parsed
+    and malformed lines are dropped.
+    """
+    fake_sock = MagicMock()
+    fake_sock.recv_into.side_effect = _recv_into_from([
+        b'{"a": 1, oops}\n{"x": [1, 2]}\n{"progress": {"percentage": 5}}\n',
+        b''
+    ])
+    conn = StreamingConnection('host', 0)
+    conn.connection = fake_sock
+    matlab_controller.connection = conn
+    matlab_controller.passthrough = True
+
+    matlab_controller.run({}, performance_monitor=performance_monitor)
+
+    mock_rabbit_client.send_raw_result.assert_called_once()
+    source, body = mock_rabbit_client.send_raw_result.call_args[0]
+    message = json.loads(body)
+    assert source == 'test_src'
+    assert message['data'] == {'x': [1, 2]}
+    assert message['sequence'] == 0
+    assert message['simulation'] == {
+        'name': 'test_file.m', 'type': 'streaming'}
+    progress = mock_rabbit_client.send_result.call_args[0][1]
+    assert progress['progress'] == {'percentage': 5}
+    assert progress['sequence'] == 1
+
+
+@patch('src.core.streaming.StreamingConnection.accept_connection')
+def test_controller_run_passthrough_rejects_nan(
+        mock_accept,
+        stdlib_json,
+        matlab_controller,
+        mock_rabbit_client,
+        performance_monitor):
+    """
+    Test the standard library fallback drops NaN and Infinity lines instead
+    of forwarding them as invalid JSON bodies.
+    """
+    fake_sock = MagicMock()
+    fake_sock.recv_into.side_effect = _recv_into_from([
+        b'{"x": NaN}\n{"x": -Infinity}\n{"x": 1.5}\n',
+        b''
+    ])
+    conn = StreamingConnection('host', 0)
+    conn.connection = fake_sock
+    matlab_controller.connection = conn
+    matlab_controller.passthrough = True
+
+    matlab_controller.run({}, performance_monitor=performance_monitor)
+
+    mock_rabbit_client.send_raw_result.assert_called_once()
+    body = mock_rabbit_client.send_raw_result.call_args[0][1]
+    message = json.loads(body, parse_constant=pytest.fail)
+    assert message['data'] == {'x': 1.5}
+    assert message['sequence'] == 0
+
+
+@patch('src.core.streaming.selectors.DefaultSelector')
+@patch('src.core.streaming.StreamingConnection.accept_connection')
+def test_controller_run_batches_outputs(
+        mock_accept,
+        mock_select,
+        matlab_controller,
+        mock_rabbit_client,
+        performance_monitor):
+    """
+    Test outputs are published in batches, flushed when full, when the
+    delay expires with no new data, on 100% progress and at disconnect.
+    """
+    fake_sock = MagicMock()
+    fake_sock.recv_into.side_effect = _recv_into_from([
+        b'{"a": 1}\n{"a": 2}\n{"a": 3}\n',
+        b'{"a": 4}\n',
+        b'{"progress": {"percentage": 100}}\n{"a": 5}\n',
+        b''
+    ])
+    # The batch delay expires after the first read, then data keeps coming
+    selector = mock_select.return_value.__enter__.return_value
+    selector.select.side_effect = [[], [(MagicMock(), 1)], [(MagicMock(), 1)]]
+    conn = StreamingConnection('host', 0)
+    conn.connection = fake_sock
+    matlab_controller.connection = conn
+    matlab_controller.batch_size = 2
+    matlab_controller.batch_delay = 60
+
+    matlab_controller.run({}, performance_monitor=performance_monitor)
+
+    mock_rabbit_client.send_result.assert_not_called()
+    batches = [[m['sequence'] for m in c[0][1]]
+               for c in mock_rabbit_client.send_results.call_args_list]
+    assert batches == [[0, 1], [2], [3, 4], [5]]
+    assert all(c[0][0] == 'test_src'
+               for c in mock_rabbit_client.send_results.call_args_list)
+
+
+@patch('src.core.streaming.selectors.DefaultSelector')
+@patch('src.core.streaming.StreamingConnection.accept_connection')
+def test_controller_run_coalesces_outputs(
+        mock_accept,
+        mock_select,
+        matlab_controller,
+        mock_rabbit_client,
+        performance_monitor):
+    """
+    Test only the latest progress and scalar signal values of a batch are
+    published, in sequence order, while other outputs are all kept.
+    """
+    fake_sock = MagicMock()
+    fake_sock.recv_into.side_effect = _recv_into_from([
+        b'{"progress": {"percentage": 10}}\n{"t": 1.0}\n{"v": [1, 2]}\n'
+        b'{"t": 2.0}\n{"v": [3]}\n{"progress": {"percentage": 20}}\n'
+        b'{"flag": true}\n{"flag": false}\n',
+        b''
+    ])
+    selector = mock_select.return_value.__enter__.return_value
+    selector.select.return_value = [(MagicMock(), 1)]
+    conn = StreamingConnection('host', 0)
+    conn.connection = fake_sock
+    matlab_controller.connection = conn
+    matlab_controller.batch_size = 10
+    matlab_controller.batch_delay = 60
+    matlab_controller.coalesce = True
+
+    matlab_controller.run({}, performance_monitor=performance_monitor)
+
+    mock_rabbit_client.send_results.assert_called_once()
+    batch = mock_rabbit_client.send_results.call_args[0][1]
+    assert [m['sequence'] for m in batch] == [2, 3, 4, 5, 6, 7]
+    assert batch[1]['data'] == {'t': 2.0}
+    assert batch[3]['progress'] == {'percentage': 20}
+
+
+@patch('src.core.streaming.StreamingConnection.accept_connection')
+def test_controller_run_msgpack(
+        mock_accept,
+        matlab_controller,
+        mock_rabbit_client,
+        performance_monitor):
+    """
+    Test controller.run decodes msgpack outputs split across reads.
+    """
+    msgpack = pytest.importorskip('msgpack')
+    payload = msgpack.packb({'x': [1.5, 2.5]}) + msgpack.packb(
+        {'progress': {'percentage': 50}, 'data': {'y': 1}})
+    fake_sock = MagicMock()
+    fake_sock.recv.side_effect = [payload[:5], payload[5:], b'']
+    conn = StreamingConnection('host', 0)
+    conn.connection = fake_sock
+    matlab_controller.connection = conn
+    matlab_controller.wire_format = 'msgpack'
+
+    matlab_controller.run({}, performance_monitor=performance_monitor)
+
+    sent = [c[0][1] for c in mock_rabbit_client.send_result.call_args_list]
+    assert sent[0]['data'] == {'x': [1.5, 2.5]}
+    assert sent[1]['progress'] == {'percentage': 50}
+    assert [m['sequence'] for m in sent] == [0, 1]
+
+
+@patch('src.core.streaming.StreamingConnection.accept_connection')
+def test_controller_run_msgpack_passthrough(
+        mock_accept,
+        matlab_controller,
+        mock_rabbit_client,
+        performance_monitor):
+    """
+    Test plain msgpack outputs are published as JSON while progress and
+    binary outputs take the regular path.
+    """
+    msgpack = pytest.importorskip('msgpack')
+    payload = b''.join(msgpack.packb(output) for output in (
+        {'x': [1.5, 2.5]}, {'blob': b'\x00'}, {'progress': {'percentage': 50}}))
+    fake_sock = MagicMock()
+    fake_sock.recv.side_effect = [payload, b'']
+    conn = StreamingConnection('host', 0)
+    conn.connection = fake_sock
+    matlab_controller.connection = conn
+    matlab_controller.wire_format = 'msgpack'
+    matlab_controller.passthrough = True
+
+    matlab_controller.run({}, performance_monitor=performance_monitor)
+
+    source, body = mock_rabbit_client.send_raw_result.call_args[0]
+    message = json.loads(body)
+    assert source == 'test_src'
+    assert message['data'] == {'x': [1.5, 2.5]}
+    assert message['sequence'] == 0
+    sent = [c[0][1] for c in mock_rabbit_client.send_result.call_args_list]
+    assert sent[0]['data'] == {'blob': b'\x00'}
+    assert sent[1]['progress'] == {'percentage': 50}
+    assert [m['sequence'] for m in sent] == [1, 2]
+
+
+@patch('src.core.streaming.StreamingConnection.accept_connection')
+def test_controller_run_msgpack_passthrough_rejects_nan(
+        mock_accept,
+        stdlib_json,
+        matlab_controller,
+        mock_rabbit_client,
+        performance_monitor):
+    """
+    Test the standard library fallback leaves non-finite msgpack outputs to
+    the regular path instead of publishing NaN in a JSON body.
+    """
+    msgpack = pytest.importorskip('msgpack')
+    fake_sock = MagicMock()
+    fake_sock.recv.side_effect = [msgpack.packb({'x': float('nan')}), b'']
+    conn = StreamingConnection('host', 0)
+    conn.connection = fake_sock
+    matlab_controller.connection = conn
+    matlab_controller.wire_format = 'msgpack'
+    matlab_controller.passthrough = True
+
+    matlab_controller.run({}, performance_monitor=performance_monitor)
+
+    mock_rabbit_client.send_raw_result.assert_not_called()
+    sent = mock_rabbit_client.send_result.call_args[0][1]
+    assert sent['sequence'] == 0
+
+
+def test_controller_rejects_unknown_wire_format(
+        matlab_controller, mock_rabbit_client, response_templates):
+    """
+    Test the controller refuses an unsupported wire format.
+    """
+    with pytest.raises(ValueError, match='Unsupported wire format'):
+        MatlabStreamingController(
+            str(Path.cwd()), 'test_file.m', 'src', mock_rabbit_client,
+            response_templates, {'wire_format': 'xml'})
+
+
 def test_get_metadata(matlab_controller, monkeypatch):
     """
     Test get_metadata returns all expected monitoring keys.
@@ -282,8 +885,14 @@ def test_get_metadata(matlab_controller, monkeypatch):
         def memory_info(self):
             return MagicMock(rss=1024 * 1024)  # 1 MB
 
-        def cpu_percent(self):
-            return 5.0  # 5% CPU usage
+        def cpu_times(self):
+            return MagicMock(user=0.08, system=0.02)
+
+        def create_time(self):
+            return time.time() - 2.0  # 0.1s of CPU in 2s: 5% CPU usage
+
+        def children(self, recursive=False):
+            return []
 
         def poll(self):
             """Simula il controllo del processo (None se attivo, codice di uscita se terminato)."""
@@ -310,7 +919,8 @@ def test_get_metadata(matlab_controller, monkeypatch):
 
     # Setup controller with process and start time
     matlab_controller.connection.matlab_process = FakeProc()
-    matlab_controller.start_time = time.time() - 2  # 2 seconds ago
+    # 2 seconds ago
+    matlab_controller.start_time_ns = time.monotonic_ns() - 2_000_000_000
 
     # Get metadata
     metadata = matlab_controller.get_metadata()
@@ -324,7 +934,25 @@ def test_get_metadata(matlab_controller, monkeypatch):
     # Verify values make sense
     assert metadata['execution_time'] >= 2.0  # At least 2 seconds
     assert metadata['matlab_memory'] == 1.0  # 1 MB
-    assert metadata['matlab_cpu'] == 5.0  # 5%
+    assert metadata['matlab_cpu'] == pytest.approx(5.0, abs=0.1)  # 5%
+
+
+def test_get_metadata_uses_sampled_snapshot(matlab_controller, monkeypatch):
+    """
+    Test that a running sampler serves metadata from its cached snapshot.
+    """
+    samples = iter([{'memory_usage': 1}, {'memory_usage': 2}])
+    monkeypatch.setattr(
+        'src.core.streaming.MatlabStreamingController._sample_resources',
+        lambda self: next(samples))
+    monkeypatch.setattr('src.core.streaming.METADATA_SAMPLE_INTERVAL', 60)
+
+    matlab_controller._start_sampler()
+    assert matlab_controller.get_metadata() == {'memory_usage': 1}
+    assert matlab_controller.get_metadata() == {'memory_usage': 1}
+
+    matlab_controller.close()
+    assert matlab_controller.get_metadata() == {'memory_usage': 2}
 
 
 def test_handle_streaming_error_bad_request(
@@ -350,6 +978,26 @@ def test_handle_streaming_error_bad_request(
     assert sent_data['error']['type'] == 'bad_request'
 
 
+def test_handle_streaming_error_formats_traceback(
+        mock_rabbit_client, response_templates):
+    """
+    Test the error traceback is sent as text when stack traces are enabled.
+    """
+    response_templates['error']['include_stacktrace'] = True
+    try:
+        raise MatlabStreamingError('MATLAB crashed')
+    except MatlabStreamingError as e:
+        error = e
+
+    _handle_streaming_error(
+        'test_file.m', error, 'test_queue', mock_rabbit_client,
+        response_templates)
+
+    sent_data = mock_rabbit_client.send_result.call_args[0][1]
+    assert sent_data['error']['traceback'].startswith('Traceback')
+    assert 'MatlabStreamingError: MATLAB crashed' in sent_data['error']['traceback']
+
+
 def test_handle_streaming_simulation_missing_fields(
         monkeypatch, mock_rabbit_client, response_templates, tcp_settings):
     """